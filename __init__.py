@@ -0,0 +1,73 @@
+# thomasa88lib, a library of useful Fusion 360 add-in/script functions.
+#
+# Submodules are loaded on first access, so that an add-in only pays for
+# the modules that it uses:
+#
+#     from .thomasa88lib import settings
+#
+# import_report() shows how long the loaded submodules took to import.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import importlib
+import time
+
+_SUBMODULES = ('aioloop', 'apicache', 'commands', 'error', 'events', 'manifest',
+               'profiler', 'settings', 'timeline', 'utils')
+
+__all__ = list(_SUBMODULES) + ['import_report']
+
+# Submodule name -> (self seconds, cumulative seconds)
+import_times = {}
+# Time spent in nested submodule imports, per import in progress
+_nested_times = []
+
+def __getattr__(name):
+    # Called when a submodule has not been imported yet
+    if name not in _SUBMODULES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    _nested_times.append(0.0)
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module('.' + name, __name__)
+    finally:
+        cumulative = time.perf_counter() - start
+        nested = _nested_times.pop()
+        if _nested_times:
+            _nested_times[-1] += cumulative
+        import_times[name] = (cumulative - nested, cumulative)
+    return module
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+def import_report():
+    '''Returns the import times of the submodules loaded so far, in the
+    style of "python -X importtime". Only imports that went through this
+    package, such as "from .thomasa88lib import events", are timed.'''
+    lines = ['import time: self [us] | cumulative | module']
+    for name, (self_secs, cumulative) in sorted(import_times.items(),
+                                                key=lambda item: item[1][1],
+                                                reverse=True):
+        lines.append(f'import time: {self_secs * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {name}')
+    total = sum(self_secs for self_secs, _ in import_times.values())
+    lines.append(f'import time: {total * 1e6:9.0f} | {"":10} | (total)')
+    return '\n'.join(lines)
@@ -0,0 +1,209 @@
+# asyncio event loop for Fusion add-ins. Used by events.EventsManager.asyncio_loop().
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import selectors
+import threading
+import time
+
+class _BridgeSelector(selectors.BaseSelector):
+    '''Selector used by FusionEventLoop.
+
+    The blocking select() is done by the selector thread of the loop.
+    When the loop runs on the main thread, it gets the events found
+    by that thread, or polls without blocking.
+    '''
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+        self.ready_events = None
+
+    def register(self, fileobj, events, data=None):
+        return self.selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self.selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self.selector.modify(fileobj, events, data)
+
+    def select(self, timeout=None):
+        events = self.ready_events
+        if events is None:
+            return self.selector.select(0)
+        self.ready_events = None
+        return events
+
+    def close(self):
+        self.selector.close()
+
+    def get_map(self):
+        return self.selector.get_map()
+
+class FusionEventLoop(asyncio.SelectorEventLoop):
+    '''asyncio event loop that runs on Fusion's main thread.
+
+    The loop never blocks the main thread. It runs its ready callbacks
+    in a custom event, for at most slice_secs at a time. When it has
+    nothing ready, a selector thread waits for I/O or the next timer
+    and then posts the custom event to wake the loop.
+
+    Use EventsManager.asyncio_loop() to get the loop. Coroutine callbacks
+    given to EventsManager.add_handler() are run as tasks in this loop.
+
+    Note: On Windows, selector event loops only support sockets, not
+    subprocess pipes.
+    '''
+    def __init__(self, events_manager, slice_secs=0.008):
+        # Set before the base class adds its self-pipe reader
+        self._selector_thread = None
+        self._in_tick = False
+        self._closing = False
+        super().__init__(_BridgeSelector())
+        self.events_manager = events_manager
+        self.slice_secs = slice_secs
+        self.event_id = events_manager.event_id_prefix + '_asyncio_event'
+
+        # Wake-up latency: time from posting the custom event until
+        # it is handled on the main thread
+        self.wake_count = 0
+        self.wake_latency_total = 0.0
+        self.wake_latency_max = 0.0
+        self._posted_at = None
+
+        self._select_cond = threading.Condition()
+        self._select_requested = False
+        self._select_timeout = None
+
+    def start(self):
+        event = self.events_manager.register_event(self.event_id)
+        self.events_manager.add_handler(event, callback=self._wake_event_handler)
+        # Makes is_running() true and enables the thread checks in debug mode
+        self._thread_id = threading.get_ident()
+        self._selector_thread = threading.Thread(target=self._select_loop,
+                                                 name='thomasa88lib asyncio selector',
+                                                 daemon=True)
+        self._selector_thread.start()
+        self._post_wake()
+
+    def close(self):
+        if self.is_closed():
+            return
+        if self._selector_thread:
+            with self._select_cond:
+                self._closing = True
+                self._select_cond.notify()
+            self._write_to_self()
+            self._selector_thread.join(timeout=1)
+            self._selector_thread = None
+        self._thread_id = None
+        super().close()
+
+    def wake_latency(self):
+        '''Returns statistics for the wake-up latency, in seconds.'''
+        return {
+            'count': self.wake_count,
+            'avg': self.wake_latency_total / self.wake_count if self.wake_count else 0.0,
+            'max': self.wake_latency_max,
+        }
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self._wake_if_idle()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        self._wake_if_idle()
+        return handle
+
+    def _add_reader(self, fd, callback, *args):
+        super()._add_reader(fd, callback, *args)
+        self._wake_if_idle()
+
+    def _add_writer(self, fd, callback, *args):
+        super()._add_writer(fd, callback, *args)
+        self._wake_if_idle()
+
+    def _wake_if_idle(self):
+        # Work added outside of a tick (e.g. from a Fusion event handler)
+        # must interrupt the selector thread, so that the loop runs again.
+        if self._selector_thread and not self._in_tick:
+            self._write_to_self()
+
+    def _post_wake(self):
+        self._posted_at = time.perf_counter()
+        self.events_manager.app.fireCustomEvent(self.event_id, '')
+
+    def _select_loop(self):
+        selector = self._selector.selector
+        while True:
+            with self._select_cond:
+                while not self._select_requested and not self._closing:
+                    self._select_cond.wait()
+                if self._closing:
+                    return
+                self._select_requested = False
+                timeout = self._select_timeout
+            events = selector.select(timeout)
+            if self._closing:
+                return
+            self._selector.ready_events = events
+            self._post_wake()
+
+    def _wake_event_handler(self, args):
+        if self._posted_at is not None:
+            latency = time.perf_counter() - self._posted_at
+            self._posted_at = None
+            self.wake_count += 1
+            self.wake_latency_total += latency
+            self.wake_latency_max = max(self.wake_latency_max, latency)
+
+        if self.is_closed():
+            return
+
+        deadline = time.perf_counter() + self.slice_secs
+        old_loop = asyncio._get_running_loop()
+        asyncio._set_running_loop(self)
+        self._in_tick = True
+        try:
+            while True:
+                self._run_once()
+                if not self._ready or time.perf_counter() >= deadline:
+                    break
+        finally:
+            self._in_tick = False
+            asyncio._set_running_loop(old_loop)
+
+        if self._ready:
+            # More to do. Let Fusion process its events first.
+            self._post_wake()
+        else:
+            timeout = None
+            if self._scheduled:
+                timeout = max(0, self._scheduled[0].when() - self.time())
+            with self._select_cond:
+                self._select_timeout = timeout
+                self._select_requested = True
+                self._select_cond.notify()
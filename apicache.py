@@ -0,0 +1,211 @@
+# Caching proxies for Fusion API objects.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+_MISSING = object()
+
+# Methods that only read from the model. Their results are cached, per
+# arguments. All other method calls go straight to Fusion and invalidate
+# the scope, as they might change the model.
+PURE_METHODS = frozenset(('classType', 'objectType', 'item', 'itemById', 'itemByName',
+                          'findEntityByToken'))
+
+_base_class = None
+
+def _is_api_object(obj):
+    global _base_class
+    if _base_class is None:
+        import adsk.core
+        _base_class = adsk.core.Base
+    return isinstance(obj, _base_class)
+
+class ReadScope:
+    '''
+    Remembers reads from Fusion API objects, to avoid repeated calls into
+    Fusion.
+
+    Objects wrapped with wrap() return cached values for attribute reads and
+    for calls to the methods in PURE_METHODS, such as item(). Objects returned
+    from the wrapped objects are wrapped as well. The cache is dropped when
+    the scope exits, when invalidate() is called, when an attribute is set or
+    any other method is called through a proxy and, if an EventsManager is
+    given, when a command terminates.
+
+    Usage:
+
+        with ReadScope() as scope:
+            timeline = scope.wrap(design.timeline)
+            for obj in timeline:
+                ... obj.name ... obj.entity.classType() ...
+
+    Unwrap objects with unwrap() before giving them to static functions, such
+    as adsk.fusion.Design.cast().
+
+    A cached read costs about a microsecond of Python code, so the scope
+    saves time when the same objects are read several times, e.g. in
+    several passes over the timeline, and not in a single pass.
+    '''
+    def __init__(self, events_manager=None):
+        # Cached values are valid as long as the generation is unchanged
+        self.generation = 0
+        # Reads served from the cache, i.e. saved calls into Fusion
+        self.hits = 0
+        # Reads that went to Fusion
+        self.misses = 0
+        self._events_manager = events_manager
+        self._handler_info = None
+        # id(obj) -> (obj, proxy). Keeps obj alive, so that the id is not reused.
+        self._proxies = {}
+
+    def __enter__(self):
+        if self._events_manager:
+            self._handler_info = self._events_manager.add_handler(
+                self._events_manager.ui.commandTerminated,
+                callback=self._model_changed_handler)
+        return self
+
+    def __exit__(self, etype, value, tb):
+        if self._handler_info:
+            self._handler_info = self._events_manager.remove_handler(self._handler_info)
+        self.invalidate()
+        self._proxies.clear()
+
+    def wrap(self, obj):
+        '''Returns a caching proxy for a Fusion API object. Other values
+        are returned as-is.'''
+        if not _is_api_object(obj):
+            return obj
+        entry = self._proxies.get(id(obj))
+        if entry is None:
+            entry = self._proxies[id(obj)] = (obj, CachedProxy(obj, self))
+        return entry[1]
+
+    def invalidate(self):
+        self.generation += 1
+
+    def _model_changed_handler(self, args):
+        self.invalidate()
+
+def unwrap(obj):
+    '''Returns the Fusion API object of a CachedProxy, or the object itself.'''
+    if type(obj) is CachedProxy:
+        return object.__getattribute__(obj, '_obj')
+    return obj
+
+class CachedProxy:
+    '''Proxy created by ReadScope.wrap().'''
+    __slots__ = ('_obj', '_scope', '_values', '_generation')
+
+    def __init__(self, obj, scope):
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_scope', scope)
+        object.__setattr__(self, '_values', {})
+        object.__setattr__(self, '_generation', scope.generation)
+
+    def _cached(self, key, read, *read_args):
+        # read(*read_args) is only called on a miss, so that hits do not
+        # need to create closures
+        scope = self._scope
+        values = self._values
+        if self._generation != scope.generation:
+            values.clear()
+            object.__setattr__(self, '_generation', scope.generation)
+        value = values.get(key, _MISSING)
+        if value is not _MISSING:
+            scope.hits += 1
+        else:
+            scope.misses += 1
+            try:
+                value = read(*read_args)
+            except AttributeError as e:
+                # Remember missing attributes as well, for hasattr()
+                value = e
+            values[key] = value
+        if type(value) is AttributeError:
+            raise value
+        return value
+
+    def __getattr__(self, name):
+        return self._cached(name, self._read, name)
+
+    def _read(self, name):
+        value = getattr(self._obj, name)
+        if callable(value) and not _is_api_object(value):
+            return self._method(name, value)
+        return self._scope.wrap(value)
+
+    def _method(self, name, method):
+        scope = self._scope
+
+        def call(args, kwargs):
+            if kwargs:
+                kwargs = { key: unwrap(value) for key, value in kwargs.items() }
+            return scope.wrap(method(*[unwrap(arg) for arg in args], **kwargs))
+
+        if name not in PURE_METHODS:
+            def uncached_method(*args, **kwargs):
+                try:
+                    return call(args, kwargs)
+                finally:
+                    scope.invalidate()
+            return uncached_method
+
+        no_args_key = (name,)
+
+        def cached_method(*args, **kwargs):
+            if not args and not kwargs:
+                key = no_args_key
+            else:
+                key = (name, args, tuple(sorted(kwargs.items())))
+                try:
+                    hash(key)
+                except TypeError:
+                    scope.misses += 1
+                    return call(args, kwargs)
+            return self._cached(key, call, args, kwargs)
+        return cached_method
+
+    def __setattr__(self, name, value):
+        setattr(self._obj, name, unwrap(value))
+        self._scope.invalidate()
+
+    def __iter__(self):
+        # Iterating a Fusion collection calls item() for each object
+        scope = self._scope
+        return iter(self._cached('__iter__', lambda: [scope.wrap(item) for item in self._obj]))
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __bool__(self):
+        return bool(self._obj)
+
+    def __eq__(self, other):
+        return self._obj == unwrap(other)
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def __repr__(self):
+        return f'CachedProxy({self._obj!r})'
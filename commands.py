@@ -23,17 +23,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import adsk
-
-import getpass
+import json
 import os
-import re
-import sys
-import traceback
+import time
+
+import adsk.core
 
 # Avoid Fusion namespace pollution
 from . import utils
-from . import manifest
 
 def try_delete_cmd_def(cmd_id):
     app = adsk.core.Application.get()
@@ -47,3 +44,97 @@ def recreate_checkbox_def(cmd_id, name, tooltip, is_checked):
     app = adsk.core.Application.get()
     ui = app.userInterface
     return ui.commandDefinitions.addCheckBoxDefinition(cmd_id, name, tooltip, is_checked)
+
+class CommandRegistry:
+    '''Keeps track of all command definitions created by the add-in.
+
+    The definitions are (re)created with create() and deleted with
+    delete_all(), each in one pass over the registered IDs. The IDs are
+    saved to a file in the directory of the calling file, so that
+    definitions left behind by a crashed session are deleted on the next
+    create(), without searching through ui.commandDefinitions.
+
+    Usage:
+
+        registry_ = CommandRegistry()
+        registry_.add_checkbox('myAddinToggle', 'Toggle', 'Toggles', False)
+        registry_.add_button('myAddinRun', 'Run', 'Runs', './resources/run')
+
+        def run(context):
+            cmd_defs = registry_.create()
+            cmd_defs['myAddinRun'].commandCreated.add(...)
+
+        def stop(context):
+            registry_.delete_all()
+
+    The time taken by each phase is stored in timings, in seconds.
+    '''
+    def __init__(self, filename='command_ids.json'):
+        caller_dir = os.path.dirname(utils.get_caller_path())
+        self.file_path = os.path.join(caller_dir, filename)
+        # cmd_id -> (add method name, arguments)
+        self.definitions = {}
+        # cmd_id -> created command definition
+        self.cmd_defs = {}
+        self.timings = {}
+
+    def add_checkbox(self, cmd_id, name, tooltip, is_checked):
+        self.definitions[cmd_id] = ('addCheckBoxDefinition', (cmd_id, name, tooltip, is_checked))
+
+    def add_button(self, cmd_id, name, tooltip, resource_folder=''):
+        self.definitions[cmd_id] = ('addButtonDefinition', (cmd_id, name, tooltip, resource_folder))
+
+    def add_list(self, cmd_id, name, display_type, resource_folder=''):
+        self.definitions[cmd_id] = ('addListDefinition', (cmd_id, name, display_type, resource_folder))
+
+    def create(self):
+        '''Deletes any old definitions and creates all registered definitions.
+        Returns a dict of cmd_id -> command definition.'''
+        timings = self.timings = {}
+        start = time.perf_counter()
+        ui = adsk.core.Application.get().userInterface
+        cmd_defs = ui.commandDefinitions
+        stale_ids = set(self._load_ids())
+        stale_ids.update(self.definitions)
+        timings['load'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for cmd_id in stale_ids:
+            cmd_def = cmd_defs.itemById(cmd_id)
+            if cmd_def:
+                cmd_def.deleteMe()
+        timings['delete_stale'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.cmd_defs = {}
+        for cmd_id, (method, args) in self.definitions.items():
+            self.cmd_defs[cmd_id] = getattr(cmd_defs, method)(*args)
+        timings['create'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._save_ids(list(self.cmd_defs))
+        timings['save'] = time.perf_counter() - start
+        return self.cmd_defs
+
+    def delete_all(self):
+        '''Deletes all definitions created by create().'''
+        start = time.perf_counter()
+        for cmd_def in self.cmd_defs.values():
+            if cmd_def.isValid:
+                cmd_def.deleteMe()
+        self.cmd_defs = {}
+        self.timings['delete'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._save_ids([])
+        self.timings['save'] = time.perf_counter() - start
+
+    def _load_ids(self):
+        try:
+            with open(self.file_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save_ids(self, cmd_ids):
+        utils.write_atomic(self.file_path, json.dumps(cmd_ids))
@@ -27,20 +27,66 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import adsk
-
-import getpass
-import os
+import json
 import re
 import sys
-import traceback
+import time
 
 # Avoid Fusion namespace pollution
 from . import utils
-from . import manifest
+
+# Only keep the AddIns/Scripts part of the path
+_CALLER_PATH_RE = re.compile(r'.*API[/\\]')
+# Shorten file paths, to compact the message
+_TRACEBACK_PATH_RE = re.compile(r'"[^"]+/(?:API/AddIns|Api/Python)')
+
+_username = None
+
+def _get_username():
+    global _username
+    if _username is None:
+        import getpass
+        try:
+            _username = getpass.getuser()
+        except Exception:
+            _username = ''
+    return _username
+
+def _scrub_username(text):
+    # Attempt to scrub the user's username, if any remains
+    username = _get_username()
+    if username:
+        text = text.replace(username, '<user>')
+    return text
+
+def shorten_caller_path(path):
+    '''Shortens the path of an add-in file, for error messages.'''
+    return _scrub_username(_CALLER_PATH_RE.sub('', path))
+
+def shorten_traceback(tb_str):
+    '''Shortens the file paths in a formatted traceback.'''
+    return _scrub_username(_TRACEBACK_PATH_RE.sub('"', tb_str))
+
+class _TokenBucket:
+    def __init__(self, capacity, refill_secs):
+        self.capacity = capacity
+        self.refill_secs = refill_secs
+        self.tokens = capacity
+        self.last = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) / self.refill_secs)
+        self.last = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
 
 class ErrorCatcher():
-    def __init__(self, msgbox_in_debug=False, msg_prefix=''):
+    def __init__(self, msgbox_in_debug=False, msg_prefix='', dedupe=True, dedupe_secs=60,
+                 msgbox_burst=3, msgbox_refill_secs=10,
+                 log_path=None, log_max_bytes=1024 * 1024, log_backups=2):
         '''Initialize the error catcher.
 
         Showing a messagebox is disabled in debugging, by default,
@@ -50,6 +96,14 @@ class ErrorCatcher():
         msgbox_in_debug: Show an error message box also when debugging.
         msg_prefix: Prefix error message with this text. E.g. with
                     add-in name and version.
+        dedupe: Only report the first occurrence of an error (same exception
+                type, file and line) in full. Repeats are printed as one line,
+                until the error has not occurred for dedupe_secs seconds.
+        msgbox_burst, msgbox_refill_secs: Rate limit for message boxes. At most
+                msgbox_burst boxes are shown in a row, and then one per
+                msgbox_refill_secs seconds.
+        log_path: Append a JSON line per error to this file, from a background
+                  thread. The file is rotated at log_max_bytes.
 
         Usage:
 
@@ -64,26 +118,64 @@ class ErrorCatcher():
         '''
         self.msgbox_in_debug = msgbox_in_debug
         self.msg_prefix = msg_prefix
+        self.dedupe = dedupe
+        self.dedupe_secs = dedupe_secs
+        # (exception type, file, line) -> number of times seen
+        self.error_counts = {}
+        # (exception type, file, line) -> time.monotonic() of the last occurrence
+        self._last_seen = {}
+        self.suppressed_msgboxes = 0
+        self._msgbox_bucket = _TokenBucket(msgbox_burst, msgbox_refill_secs)
+        self.log_writer = None
+        if log_path:
+            self.log_writer = utils.BackgroundLineWriter(log_path, max_queue=256,
+                                                         max_bytes=log_max_bytes,
+                                                         backups=log_backups)
 
     def __enter__(self):
-        self.caller_file = utils.get_caller_path()
+        # Nothing to do until there is an error. The caller is looked up in
+        # __exit__(), as it is called from the same frame.
+        pass
 
     def __exit__(self, etype, value, tb):
         if tb:
+            self.caller_file = utils.get_caller_path()
+            self._report(etype, value, tb)
+            # Exception handled
+            return True
+
+    def close(self):
+        '''Writes any queued log records and stops the log writer.'''
+        if self.log_writer:
+            self.log_writer.close()
+            self.log_writer = None
+
+    def _report(self, etype, value, tb):
+        # Only needed when reporting errors
+        import adsk.core
+        import traceback
+
+        last_tb = tb
+        while last_tb.tb_next:
+            last_tb = last_tb.tb_next
+        fingerprint = (etype.__qualname__, last_tb.tb_frame.f_code.co_filename, last_tb.tb_lineno)
+        count = self.error_counts.get(fingerprint, 0) + 1
+        self.error_counts[fingerprint] = count
+        now = time.monotonic()
+        last_seen = self._last_seen.get(fingerprint)
+        self._last_seen[fingerprint] = now
+
+        caller = shorten_caller_path(self.caller_file)
+        repeated = self.dedupe and last_seen is not None and now - last_seen < self.dedupe_secs
+
+        if repeated:
+            print(f'{self.msg_prefix} error: {value} '
+                  f'({caller}, repeated {count} times, details shown earlier)')
+        else:
             app = adsk.core.Application.get()
             ui = app.userInterface
 
-            # Only keep the AddIns/Scripts part of the path
-            caller = re.sub(r'.*API[/\\]', '', self.caller_file)
-
-            tb_str = ''.join(traceback.format_exception(etype, value, tb))
-
-            # Shorten file paths, to compact the message
-            tb_str = re.sub(r'"[^"]+/(?:API/AddIns|Api/Python)', '"', tb_str)
-
-            # Attempt to scrub the user's username, if any remains
-            tb_str = tb_str.replace(getpass.getuser(), '<user>')
-            caller = caller.replace(getpass.getuser(), '<user>')
+            tb_str = shorten_traceback(''.join(traceback.format_exception(etype, value, tb)))
 
             message = (f'{self.msg_prefix} error: {value}\n\n' +
                        'Copy this message by taking a screenshot. ' +
@@ -97,8 +189,21 @@ class ErrorCatcher():
 
             in_debugger = hasattr(sys, 'gettrace') and sys.gettrace()
             if ui and (not in_debugger or self.msgbox_in_debug):
-                print("Also showed in message box.")
-                ui.messageBox(message)
-        
-            # Exception handled
-            return True
+                if self._msgbox_bucket.take():
+                    print("Also showed in message box.")
+                    ui.messageBox(message)
+                else:
+                    self.suppressed_msgboxes += 1
+                    print("Message box not shown, due to too many errors.")
+
+        if self.log_writer:
+            self.log_writer.write(json.dumps({
+                'time': time.time(),
+                'prefix': self.msg_prefix,
+                'type': fingerprint[0],
+                'file': shorten_caller_path(fingerprint[1]),
+                'line': fingerprint[2],
+                'count': count,
+                'message': _scrub_username(str(value)),
+                'caller': caller,
+            }))
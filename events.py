@@ -27,8 +27,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import adsk.core, adsk.fusion, adsk.cam, traceback
-
+# Heavier modules (adsk, asyncio, concurrent.futures, inspect, traceback)
+# are imported where they are first used, to keep add-in start-up fast.
+import heapq
+import json
+import math
+import queue
 import sys
 import threading
 import time
@@ -40,16 +44,551 @@ from . import utils
 # Try to resolve base class automatically
 AUTO_HANDLER_CLASS = None
 
+def __getattr__(name):
+    # FusionEventLoop lives in its own module, as it needs asyncio
+    if name == 'FusionEventLoop':
+        from .aioloop import FusionEventLoop
+        return FusionEventLoop
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+class DelayHandle:
+    '''Handle to a function call queued with EventsManager.delay().'''
+    def __init__(self, events_manager, delay_id):
+        self._events_manager = events_manager
+        self.delay_id = delay_id
+
+    @property
+    def pending(self):
+        '''True if the function has not been called or cancelled yet.'''
+        return self.delay_id in self._events_manager.delayed_funcs
+
+    def cancel(self):
+        '''Cancels the call. Returns False if the function has already
+        been called or cancelled.'''
+        return self._events_manager._cancel_delay(self.delay_id)
+
+class _DelayScheduler:
+    '''Single thread that fires the delay event when delays expire.
+
+    Deadlines are kept in a min-heap. Cancelled entries are left in the
+    heap and skipped when they expire, unless they start to dominate it.
+    '''
+    def __init__(self, fire):
+        self._fire = fire
+        self._heap = []
+        self._cancelled = set()
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run,
+                                        name='thomasa88lib delay scheduler',
+                                        daemon=True)
+        self._thread.start()
+
+    def schedule(self, delay_id, secs):
+        entry = (time.monotonic() + secs, delay_id)
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                # New earliest deadline
+                self._cond.notify()
+
+    def cancel(self, delay_id):
+        with self._cond:
+            self._cancelled.add(delay_id)
+            if len(self._cancelled) > 64 and len(self._cancelled) * 2 > len(self._heap):
+                self._heap = [e for e in self._heap if e[1] not in self._cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled.clear()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._cancelled.clear()
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+
+    def _run(self):
+        while True:
+            expired = []
+            with self._cond:
+                while self._running and not expired:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    timeout = self._heap[0][0] - time.monotonic()
+                    if timeout > 0:
+                        self._cond.wait(timeout)
+                        continue
+                    while self._heap and self._heap[0][0] <= time.monotonic():
+                        _, delay_id = heapq.heappop(self._heap)
+                        if delay_id in self._cancelled:
+                            self._cancelled.discard(delay_id)
+                        else:
+                            expired.append(delay_id)
+                if not self._running:
+                    return
+            # Fire outside the lock, to not block delay() callers
+            for delay_id in expired:
+                self._fire(delay_id)
+
+class _HandlerPolicy:
+    '''Collapses bursts of calls to a handler callback into fewer calls.
+
+    Modes (only one can be used):
+     * debounce: Call once the event has been quiet for the given seconds.
+     * throttle: Call at most once per the given seconds. Calls within the
+                 interval are merged into one call at the end of it.
+     * coalesce: Merge all calls during one turn of the event loop into
+                 one call.
+
+    The callback gets the arguments of the latest merged call. Note that
+    Fusion event arguments might not be usable after the event has been
+    handled, when calls are deferred.
+    '''
+    def __init__(self, events_manager, callback, debounce=None, throttle=None, coalesce=False):
+        if sum((debounce is not None, throttle is not None, bool(coalesce))) != 1:
+            raise ValueError('Exactly one of debounce, throttle and coalesce must be set')
+        self.events_manager = events_manager
+        self.callback = callback
+        self.debounce = debounce
+        self.throttle = throttle
+        self.coalesce = coalesce
+
+        # Number of times the event fired
+        self.calls = 0
+        # Number of times the callback was run
+        self.runs = 0
+        # Number of calls that were merged into a later call
+        self.merged = 0
+
+        self._pending = None
+        self._args = None
+        self._last_run = None
+
+    def __call__(self, args):
+        self.calls += 1
+        pending = self._pending is not None
+        if pending:
+            self.merged += 1
+        self._args = args
+
+        if self.debounce is not None:
+            if pending:
+                self._pending.cancel()
+            self._pending = self.events_manager.delay(self._run, self.debounce)
+        elif self.throttle is not None:
+            if pending:
+                return
+            wait = 0
+            if self._last_run is not None:
+                wait = self._last_run + self.throttle - time.monotonic()
+            if wait > 0:
+                self._pending = self.events_manager.delay(self._run, wait)
+            else:
+                self._run()
+        elif not pending:
+            self._pending = self.events_manager.delay(self._run)
+
+    def cancel(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        self._args = None
+
+    def stats(self):
+        return { 'calls': self.calls, 'runs': self.runs, 'merged': self.merged }
+
+    def _run(self):
+        args = self._args
+        self._pending = None
+        self._args = None
+        self._last_run = time.monotonic()
+        self.runs += 1
+        self.callback(args)
+
+TASK_RUNNING = 0
+TASK_DONE = 1
+TASK_CANCELLED = 2
+TASK_FAILED = 3
+
+class Task:
+    '''A generator-based task, run in time slices by TaskRunner.
+
+    The generator yields between units of work. A yielded value other
+    than None is stored as the task progress and reported to
+    progress_callback. The generator return value is stored in result.
+    '''
+    def __init__(self, runner, generator, priority, name, progress_callback, done_callback):
+        self.runner = runner
+        self.generator = generator
+        self.priority = priority
+        self.name = name
+        self.progress_callback = progress_callback
+        self.done_callback = done_callback
+        self.state = TASK_RUNNING
+        self.progress = None
+        self.result = None
+        self.exception = None
+
+    @property
+    def is_done(self):
+        return self.state != TASK_RUNNING
+
+    def cancel(self):
+        '''Stops the task. The generator is closed, so its finally blocks run.'''
+        if self.state == TASK_RUNNING:
+            self.runner._remove(self)
+            self.generator.close()
+            self._finish(TASK_CANCELLED)
+
+    def _step(self):
+        try:
+            value = next(self.generator)
+        except StopIteration as e:
+            self.runner._remove(self)
+            self.result = e.value
+            self._finish(TASK_DONE)
+            return
+        except Exception as e:
+            self.runner._remove(self)
+            self.exception = e
+            self._finish(TASK_FAILED)
+            raise
+        if value is not None:
+            self.progress = value
+            if self.progress_callback:
+                self.progress_callback(self)
+
+    def _finish(self, state):
+        self.state = state
+        if self.done_callback:
+            self.done_callback(self)
+
+class TaskRunner:
+    '''Runs generator tasks cooperatively on the main thread.
+
+    Each slice runs task steps until slice_secs has passed and then
+    gives control back to Fusion, by continuing in a delay() call.
+    The highest priority task is stepped first. Tasks with the same
+    priority take turns.
+
+    Only EventsManager.delay() is used, so the runner only depends
+    on the custom event functions of the Application.
+    '''
+    def __init__(self, events_manager, slice_secs=0.008):
+        self.events_manager = events_manager
+        self.slice_secs = slice_secs
+        self.tasks = []
+        self._scheduled = False
+
+    def add(self, generator, priority=0, name=None,
+            progress_callback=None, done_callback=None):
+        task = Task(self, generator, priority, name,
+                    progress_callback, done_callback)
+        self.tasks.append(task)
+        self._schedule()
+        return task
+
+    def cancel_all(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+    def _schedule(self):
+        if not self._scheduled and self.tasks:
+            self._scheduled = True
+            self.events_manager.delay(self._run_slice)
+
+    def _remove(self, task):
+        self.tasks.remove(task)
+
+    def _next_task(self):
+        task = max(self.tasks, key=lambda t: t.priority)
+        # Move to the back, so that tasks with equal priority take turns
+        self.tasks.remove(task)
+        self.tasks.append(task)
+        return task
+
+    def _run_slice(self):
+        self._scheduled = False
+        deadline = time.perf_counter() + self.slice_secs
+        try:
+            while self.tasks:
+                self._next_task()._step()
+                if time.perf_counter() >= deadline:
+                    break
+        finally:
+            # Let Fusion process its events before continuing
+            self._schedule()
+
+class _WorkerPool:
+    '''Thread pool that hands finished jobs back to the main thread.
+
+    Finished futures are queued and one custom event is fired for all
+    jobs that finish before the main thread gets to handle the event.
+    '''
+    def __init__(self, events_manager, max_workers, max_pending):
+        self.events_manager = events_manager
+        import concurrent.futures
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='thomasa88lib worker')
+        self.event_id = events_manager.event_id_prefix + '_worker_event'
+        self.event = events_manager.register_event(self.event_id)
+        events_manager.add_handler(self.event, callback=self._completed_event_handler)
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._completed = []
+        self._event_pending = False
+        self._shut_down = False
+
+    def submit(self, func, args, kwargs, callback):
+        if not self._slots.acquire(blocking=False):
+            raise queue.Full('Too many pending worker jobs')
+        try:
+            future = self.executor.submit(func, *args, **kwargs)
+        except:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._job_done(f, callback))
+        return future
+
+    def shutdown(self):
+        self._shut_down = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._completed.clear()
+
+    def _job_done(self, future, callback):
+        # Runs in the worker thread (or in the main thread, for cancelled jobs)
+        self._slots.release()
+        with self._lock:
+            if self._shut_down:
+                return
+            self._completed.append((future, callback))
+            if self._event_pending:
+                return
+            self._event_pending = True
+        self.events_manager.app.fireCustomEvent(self.event_id, '')
+
+    def _completed_event_handler(self, args):
+        with self._lock:
+            completed = self._completed
+            self._completed = []
+            self._event_pending = False
+        for future, callback in completed:
+            # Catch errors per job, so one failing callback does not
+            # stop the others
+            with self.events_manager.error_catcher:
+                if callback:
+                    callback(future)
+                elif not future.cancelled():
+                    # Re-raise any exception from the job
+                    future.result()
+
+class _HandlerTiming:
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+class HandlerStats:
+    '''Call count and wall time statistics per handler.
+
+    Enabled with EventsManager.enable_stats(). Percentiles come from a
+    histogram with four buckets per doubling of the time, so they are
+    accurate to about 20%.
+
+    If slow_threshold (seconds) is set, a watchdog thread prints the
+    stack of handler calls that run for longer than the threshold,
+    while they are still running.
+    '''
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self, slow_threshold=None):
+        self.timings = {}
+        self.slow_threshold = slow_threshold
+        self.slow_calls = 0
+        # (handler name, start time, thread id) of the running call
+        self._current = None
+        self._reported = None
+        self._watchdog = None
+        if slow_threshold:
+            self._watchdog = threading.Thread(target=self._watch,
+                                              name='thomasa88lib slow call watchdog',
+                                              daemon=True)
+            self._watchdog.start()
+
+    def stop(self):
+        self._watchdog = None
+
+    def begin(self, handler_name):
+        '''Marks the start of a call. Returns a token for end().'''
+        previous = self._current
+        self._current = (handler_name, time.perf_counter(), threading.get_ident())
+        return previous
+
+    def end(self, token):
+        current = self._current
+        self._current = token
+        handler_name, start, _ = current
+        secs = time.perf_counter() - start
+        self.record(handler_name, secs)
+        if self.slow_threshold and secs > self.slow_threshold:
+            self.slow_calls += 1
+            if self._reported is not current:
+                print(f'Slow handler {handler_name}: {secs * 1000:.1f} ms')
+
+    def record(self, handler_name, secs):
+        timing = self.timings.get(handler_name)
+        if timing is None:
+            timing = self.timings[handler_name] = _HandlerTiming()
+        timing.count += 1
+        timing.total += secs
+        if secs > timing.max:
+            timing.max = secs
+        micros = secs * 1e6
+        bucket = int(math.log2(micros) * self.BUCKETS_PER_OCTAVE) if micros > 1 else 0
+        timing.buckets[bucket] = timing.buckets.get(bucket, 0) + 1
+
+    def percentile(self, handler_name, percent):
+        '''Returns the upper limit, in seconds, of the histogram bucket
+        containing the given percentile.'''
+        timing = self.timings[handler_name]
+        wanted = timing.count * percent / 100
+        seen = 0
+        for bucket in sorted(timing.buckets):
+            seen += timing.buckets[bucket]
+            if seen >= wanted:
+                return min(2 ** ((bucket + 1) / self.BUCKETS_PER_OCTAVE) / 1e6, timing.max)
+        return timing.max
+
+    def summary(self):
+        return { name: {
+                     'count': timing.count,
+                     'total': timing.total,
+                     'max': timing.max,
+                     'p50': self.percentile(name, 50),
+                     'p95': self.percentile(name, 95),
+                     'p99': self.percentile(name, 99),
+                 } for name, timing in self.timings.items() }
+
+    def to_json(self, **json_args):
+        return json.dumps(self.summary(), **json_args)
+
+    def format_table(self):
+        '''Returns the statistics as a text table, with times in
+        milliseconds. Sorted by total time.'''
+        lines = [f'{"handler":40} {"count":>8} {"total":>10} {"max":>8} {"p50":>8} {"p95":>8} {"p99":>8}']
+        summary = self.summary()
+        for name in sorted(summary, key=lambda n: summary[n]['total'], reverse=True):
+            row = summary[name]
+            lines.append(f'{name:40} {row["count"]:8} ' +
+                         ' '.join(f'{row[col] * 1000:{10 if col == "total" else 8}.2f}'
+                                  for col in ('total', 'max', 'p50', 'p95', 'p99')))
+        return '\n'.join(lines)
+
+    def _watch(self):
+        me = self._watchdog
+        interval = self.slow_threshold / 2
+        while self._watchdog is me:
+            time.sleep(interval)
+            current = self._current
+            if (current is None or current is self._reported or
+                time.perf_counter() - current[1] < self.slow_threshold):
+                continue
+            self._reported = current
+            import traceback
+            frame = sys._current_frames().get(current[2])
+            stack = ''.join(traceback.format_stack(frame)) if frame else ''
+            print(f'Slow handler {current[0]}, still running after '
+                  f'{self.slow_threshold * 1000:.0f} ms:\n{stack}')
+
+# Handler base class per Python event class
+_handler_base_classes = {}
+
+def _get_handler_base_class(event):
+    base_class = _handler_base_classes.get(type(event))
+    if base_class is None:
+        handler_class_typename = event.classType() + 'Handler'
+        handler_class_parts = handler_class_typename.split('::')
+        base_class = sys.modules[handler_class_parts[0]]
+        for cls in handler_class_parts[1:]:
+            base_class = getattr(base_class, cls)
+        _handler_base_classes[type(event)] = base_class
+    return base_class
+
+class EventTracer:
+    '''Records dispatched events to a file, for replay with
+    EventsManager.replay_trace().
+
+    The file has one JSON array per line:
+    [time since start, handler name, event type, duration, payload].
+    The payload is the additionalInfo of custom events, otherwise null.
+    The first line holds trace metadata. Lines are formatted and written
+    by a background thread.
+    '''
+    FORMAT_VERSION = 1
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.start = time.perf_counter()
+        self.writer = utils.BackgroundLineWriter(file_path, max_queue=4096, format=json.dumps)
+        self.writer.write({ 'version': self.FORMAT_VERSION, 'start': time.time() })
+
+    @property
+    def dropped(self):
+        return self.writer.dropped
+
+    def record(self, handler_name, event_type, start, duration, payload):
+        self.writer.write((start - self.start, handler_name, event_type, duration, payload))
+
+    def close(self):
+        self.writer.close()
+
+class _ReplayEventArgs:
+    '''Event arguments given to handlers during replay.'''
+    def __init__(self, payload):
+        self.additionalInfo = payload
+        self.firingEvent = None
+
 class EventsManager:
-    def __init__(self, error_catcher=None):
-        self.handlers = []
+    def __init__(self, error_catcher=None, max_workers=2, max_pending_jobs=64,
+                 task_slice_secs=0.008):
+        # Insertion ordered set of (handler, event)
+        self.handlers = {}
+        # Handlers indexed by key and by callback. Not by event, as Fusion
+        # returns a new event object every time an event property is read.
+        self.handlers_by_key = {}
+        self.handlers_by_callback = {}
+        # Generated handler classes per (base class, callback)
+        self.handler_classes = {}
         self.custom_event_names = []
 
         self.next_delay_id = 0
         self.delayed_funcs = {}
         self.delayed_event = None
-        self.delayed_event_id = utils.get_caller_path() + '_delay_event'
+        self.event_id_prefix = utils.get_caller_path()
+        self.delayed_event_id = self.event_id_prefix + '_delay_event'
+        self.delay_scheduler = None
+        self.task_runner = None
+        # Time budget per slice of run_task() tasks
+        self.task_slice_secs = task_slice_secs
 
+        self.max_workers = max_workers
+        self.max_pending_jobs = max_pending_jobs
+        self.worker_pool = None
+        self.loop = None
+        self.stats = None
+        self.tracer = None
+        # True when stats or tracing is enabled
+        self._instrumented = False
+
+        import adsk.core
         self.app = adsk.core.Application.get()
         self.ui = self.app.userInterface
 
@@ -58,42 +597,140 @@ class EventsManager:
         self.error_catcher = error_catcher
     
     def clean_up(self):
+        self.disable_stats()
+        self.stop_trace()
+        if self.loop:
+            self.loop.close()
+            self.loop = None
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+        if self.task_runner:
+            self.task_runner.cancel_all()
+            self.task_runner = None
+        if self.delay_scheduler:
+            self.delay_scheduler.stop()
+            self.delay_scheduler = None
+        self.delayed_funcs.clear()
         self.remove_all_handlers()
         self.unregister_all_events()
+        self.handler_classes.clear()
     
-    def add_handler(self, event, base_class=AUTO_HANDLER_CLASS, callback=None):
+    def add_handler(self, event, base_class=AUTO_HANDLER_CLASS, callback=None,
+                    debounce=None, throttle=None, coalesce=False, key=None):
+        '''Adds a handler that calls callback when the event fires.
+
+        debounce, throttle (seconds) and coalesce can be used to collapse
+        bursts of calls. See _HandlerPolicy.
+        key: Any hashable value, e.g. a string. remove_key_handlers(key)
+             removes all handlers added with the key. Use it to remove
+             the handlers of an event, as reading an event property,
+             such as app.documentActivated, gives a new object each time.
+
+        Returns a handle for remove_handler().
+        '''
         if base_class == AUTO_HANDLER_CLASS:
-            handler_class_typename = event.classType() + 'Handler'
-            handler_class_parts = handler_class_typename.split('::')
-            base_class = sys.modules[handler_class_parts[0]]
-            for cls in handler_class_parts[1:]:
-                base_class = getattr(base_class, cls)
-        handler_name = base_class.__name__ + '_' + callback.__name__
-        handler_class = type(handler_name, (base_class,),
-                            { "notify": self._error_catcher_wrapper(callback) })
-        handler_class.__init__ = lambda self: super(handler_class, self).__init__()
+            base_class = _get_handler_base_class(event)
+
+        policy = None
+        if debounce is not None or throttle is not None or coalesce:
+            policy = _HandlerPolicy(self, callback, debounce, throttle, coalesce)
+            handler_class = self._create_handler_class(base_class, callback, policy)
+        else:
+            # The class only depends on the base class and the callback,
+            # so it can be reused when handlers are added again.
+            class_key = (base_class, callback)
+            handler_class = self.handler_classes.get(class_key)
+            if handler_class is None:
+                handler_class = self._create_handler_class(base_class, callback, None)
+                self.handler_classes[class_key] = handler_class
         handler = handler_class()
+        handler.policy = policy
+        handler.callback = callback
+        handler.key = key
         handler_info = (handler, event)
 
         result = event.add(handler)
         if not result:
-            raise Exception('Failed to add handler ' + callback.__name__)
+            raise Exception('Failed to add handler ' + handler_class.__name__)
         
         # Avoid garbage collection
-        self.handlers.append(handler_info)
+        self.handlers[handler_info] = None
+        if key is not None:
+            self.handlers_by_key.setdefault(key, {})[handler_info] = None
+        self.handlers_by_callback.setdefault(callback, {})[handler_info] = None
         return handler_info
 
+    def _create_handler_class(self, base_class, callback, policy):
+        import inspect
+        handler_name = base_class.__name__ + '_' + callback.__name__
+        event_type = base_class.__name__.replace('Handler', '')
+        if inspect.iscoroutinefunction(callback):
+            callback = self._coroutine_runner(callback)
+        if policy:
+            policy.callback = callback
+            callback = policy
+        handler_class = type(handler_name, (base_class,),
+                            { "notify": self._error_catcher_wrapper(callback, handler_name, event_type) })
+        handler_class.__init__ = lambda self: super(handler_class, self).__init__()
+        return handler_class
+
     def remove_handler(self, handler_info):
         handler, event = handler_info
-        self.handlers.remove(handler_info)
+        del self.handlers[handler_info]
+        self._unindex_handler(handler_info)
         event.remove(handler)
+        if handler.policy:
+            handler.policy.cancel()
         # Let user assign their handle with the return value
         return None
 
+    def remove_key_handlers(self, key):
+        '''Removes all handlers added with the given key.'''
+        for handler_info in list(self.handlers_by_key.get(key, ())):
+            self.remove_handler(handler_info)
+
+    def remove_callback_handlers(self, callback):
+        '''Removes all handlers that call the given callback.'''
+        for handler_info in list(self.handlers_by_callback.get(callback, ())):
+            self.remove_handler(handler_info)
+
+    def _unindex_handler(self, handler_info):
+        handler = handler_info[0]
+        for index, key in ((self.handlers_by_key, handler.key),
+                           (self.handlers_by_callback, handler.callback)):
+            if key is None:
+                continue
+            infos = index[key]
+            del infos[handler_info]
+            if not infos:
+                del index[key]
+
+    def policy_stats(self):
+        '''Returns call, run and merge counts for all handlers that have
+        a debounce, throttle or coalesce policy, keyed by handler name.
+        Counts of handlers with the same name, e.g. two lambdas for the same
+        event type, are added together.'''
+        stats = {}
+        for handler, event in self.handlers:
+            if handler.policy:
+                handler_stats = handler.policy.stats()
+                total = stats.get(type(handler).__name__)
+                if total is None:
+                    stats[type(handler).__name__] = handler_stats
+                else:
+                    for name, count in handler_stats.items():
+                        total[name] += count
+        return stats
+
     def remove_all_handlers(self):
         for handler, event in self.handlers:
             event.remove(handler)
+            if handler.policy:
+                handler.policy.cancel()
         self.handlers.clear()
+        self.handlers_by_key.clear()
+        self.handlers_by_callback.clear()
     
     def register_event(self, name):
         # Make sure there is not an old event registered due to a bad stop
@@ -112,6 +749,8 @@ class EventsManager:
     def delay(self, func, secs=0):
         '''Puts a function at the end of the event queue,
         and optionally delays it.
+
+        Returns a DelayHandle, which can be used to cancel the call.
         '''
 
         if self.delayed_event is None:
@@ -123,26 +762,191 @@ class EventsManager:
         delay_id = self.next_delay_id
         self.next_delay_id += 1
 
-        def waiter():
-            time.sleep(secs)
-            self.app.fireCustomEvent(self.delayed_event_id, str(delay_id))
-
         self.delayed_funcs[delay_id] = func
 
         if secs > 0:
-            thread = threading.Thread(target=waiter)
-            thread.isDaemon = True
-            thread.start()
+            if self.delay_scheduler is None:
+                self.delay_scheduler = _DelayScheduler(self._fire_delayed_event)
+            self.delay_scheduler.schedule(delay_id, secs)
         else:
-            self.app.fireCustomEvent(self.delayed_event_id, str(delay_id))    
+            self._fire_delayed_event(delay_id)
+
+        return DelayHandle(self, delay_id)
+
+    def run_task(self, generator, priority=0, name=None,
+                 progress_callback=None, done_callback=None):
+        '''Runs a generator as a time-sliced task on the main thread.
+        Returns a Task. See TaskRunner. Each slice runs for about
+        task_slice_secs, as given to the constructor.
 
-    def _error_catcher_wrapper(class_self, func):
+        Usage:
+
+            def rename_all(features):
+                for i, feature in enumerate(features):
+                    feature.name = ...
+                    yield i / len(features)
+
+            events_manager.run_task(rename_all(features))
+        '''
+        if self.task_runner is None:
+            self.task_runner = TaskRunner(self, self.task_slice_secs)
+        return self.task_runner.add(generator, priority, name,
+                                    progress_callback, done_callback)
+
+    def submit(self, func, *args, callback=None, **kwargs):
+        '''Runs func(*args, **kwargs) in a worker thread and returns a
+        concurrent.futures.Future.
+
+        callback is called with the future on the main thread when the
+        job is done, wrapped in the error catcher. Without a callback,
+        any exception raised by the job is reported by the error catcher.
+
+        The job must not use the Fusion API, as it does not run on the
+        main thread. queue.Full is raised if max_pending_jobs jobs are
+        already queued or running.
+        '''
+        if self.worker_pool is None:
+            self.worker_pool = _WorkerPool(self, self.max_workers, self.max_pending_jobs)
+        return self.worker_pool.submit(func, args, kwargs, callback)
+
+    def asyncio_loop(self):
+        '''Returns the FusionEventLoop of this manager, creating it on
+        first use. It is closed by clean_up().
+
+        Usage:
+
+            async def fetch():
+                reader, writer = await asyncio.open_connection('localhost', 8080)
+                ...
+
+            events_manager.asyncio_loop().create_task(fetch())
+        '''
+        if self.loop is None:
+            from .aioloop import FusionEventLoop
+            self.loop = FusionEventLoop(self)
+            self.loop.start()
+        return self.loop
+
+    def _coroutine_runner(self, coroutine_func):
+        def run(args):
+            task = self.asyncio_loop().create_task(coroutine_func(args))
+            task.add_done_callback(self._report_task_exception)
+        run.__name__ = coroutine_func.__name__
+        return run
+
+    def _report_task_exception(self, task):
+        if not task.cancelled():
+            with self.error_catcher:
+                task.result()
+
+    def _fire_delayed_event(self, delay_id):
+        self.app.fireCustomEvent(self.delayed_event_id, str(delay_id))
+
+    def _cancel_delay(self, delay_id):
+        if self.delayed_funcs.pop(delay_id, None) is None:
+            return False
+        if self.delay_scheduler:
+            self.delay_scheduler.cancel(delay_id)
+        return True
+
+    def enable_stats(self, slow_threshold=None):
+        '''Starts collecting call statistics for all handlers. Returns
+        the HandlerStats object, which is also available as self.stats.'''
+        self.disable_stats()
+        self.stats = HandlerStats(slow_threshold)
+        self._instrumented = True
+        return self.stats
+
+    def disable_stats(self):
+        if self.stats:
+            self.stats.stop()
+            self.stats = None
+        self._instrumented = self.tracer is not None
+
+    def start_trace(self, file_path):
+        '''Starts recording all dispatched events to file_path. Returns
+        the EventTracer, which is also available as self.tracer.'''
+        self.stop_trace()
+        self.tracer = EventTracer(file_path)
+        self._instrumented = True
+        return self.tracer
+
+    def stop_trace(self):
+        if self.tracer:
+            self.tracer.close()
+            self.tracer = None
+        self._instrumented = self.stats is not None
+
+    def replay_trace(self, file_path, speed=None):
+        '''Feeds the events of a trace, recorded with start_trace(), to the
+        handlers currently added, matched by handler name.
+
+        speed: None to replay as fast as possible, 1.0 for the original
+               timing, 2.0 for twice as fast, etc.
+
+        Handlers only get additionalInfo (for custom events) in the event
+        arguments. Internal handlers of the manager, such as the delay()
+        handler, are skipped. Returns (replayed, skipped) event counts.
+        '''
+        handlers = {}
+        for handler, event in self.handlers:
+            if getattr(handler.callback, '__self__', None) is self:
+                continue
+            handlers.setdefault(type(handler).__name__, handler)
+
+        replayed = 0
+        skipped = 0
+        replay_start = time.perf_counter()
+        with open(file_path, encoding='utf-8') as f:
+            # Metadata
+            f.readline()
+            for line in f:
+                try:
+                    offset, handler_name, event_type, duration, payload = json.loads(line)
+                except ValueError:
+                    # Torn write at the end of the trace
+                    break
+                handler = handlers.get(handler_name)
+                if handler is None:
+                    skipped += 1
+                    continue
+                if speed:
+                    wait = replay_start + offset / speed - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                handler.notify(_ReplayEventArgs(payload))
+                replayed += 1
+        return replayed, skipped
+
+    def _error_catcher_wrapper(class_self, func, handler_name, event_type):
         def catcher(func_self, args):
+            if class_self._instrumented:
+                class_self._instrumented_call(func, args, handler_name, event_type)
+                return
             with class_self.error_catcher:
                 func(args)
         return catcher
 
-    def _delayed_event_handler(self, args: adsk.core.CustomEventArgs):
+    def _instrumented_call(self, func, args, handler_name, event_type):
+        stats = self.stats
+        tracer = self.tracer
+        if stats:
+            token = stats.begin(handler_name)
+        start = time.perf_counter()
+        try:
+            with self.error_catcher:
+                func(args)
+        finally:
+            if stats:
+                stats.end(token)
+            if tracer:
+                payload = None
+                if event_type == 'CustomEvent':
+                    payload = args.additionalInfo
+                tracer.record(handler_name, event_type, start,
+                              time.perf_counter() - start, payload)
+
+    def _delayed_event_handler(self, args: 'adsk.core.CustomEventArgs'):
         delay_id = int(args.additionalInfo)
         func = self.delayed_funcs.pop(delay_id, lambda: None)
         func()
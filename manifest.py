@@ -24,15 +24,114 @@
 # SOFTWARE.
 
 import json
+import os
 import pathlib
 
 # Avoid Fusion namespace pollution
 from . import utils
 
+# Directory -> (manifest path, file signature, manifest)
+_cache = {}
+
 def read(directory=None):
+    '''Reads the manifest of the add-in in directory, or of the add-in of the
+    calling file.
+
+    The manifest is cached and is only read again when the file has changed.
+    '''
     if not directory:
         caller_path = pathlib.Path(utils.get_caller_path())
         directory = caller_path.parent
+    directory = str(directory)
+    entry = _cache.get(directory)
+    if entry is not None:
+        manifest_path, signature, manifest = entry
+        if _file_signature(manifest_path) == signature:
+            # Copy, so that the caller can modify it
+            return dict(manifest)
     manifest_path = next(pathlib.Path(directory).glob('*.manifest'))
+    signature = _file_signature(manifest_path)
     with open(manifest_path, encoding='utf-8') as manifest_file:
-        return json.load(manifest_file)
\ No newline at end of file
+        manifest = json.load(manifest_file)
+    _cache[directory] = (manifest_path, signature, manifest)
+    return dict(manifest)
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class ManifestEntry:
+    __slots__ = ('id', 'version', 'path', 'manifest', 'folder_mtime', 'signature')
+
+    def __init__(self, path, manifest, folder_mtime, signature):
+        self.id = manifest.get('id')
+        self.version = manifest.get('version')
+        self.path = path
+        self.manifest = manifest
+        self.folder_mtime = folder_mtime
+        self.signature = signature
+
+class ManifestIndex:
+    '''
+    Index of the manifests of all add-ins in a directory, such as the
+    Fusion AddIns directory.
+
+    refresh() rescans the directory, but only parses manifests that are new
+    or have changed since the last scan.
+    '''
+    def __init__(self, root):
+        self.root = str(root)
+        # Add-in folder path -> ManifestEntry
+        self.entries = {}
+        self.by_id = {}
+        self.parsed = 0
+        self.reused = 0
+        self.refresh()
+
+    def get(self, addin_id):
+        return self.by_id.get(addin_id)
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def refresh(self):
+        entries = {}
+        with os.scandir(self.root) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                # Adding, removing or renaming a file changes the folder mtime
+                folder_mtime = folder.stat().st_mtime_ns
+                entry = self.entries.get(folder.path)
+                if (entry is not None and entry.folder_mtime == folder_mtime and
+                    _file_signature(entry.path) == entry.signature):
+                    entries[folder.path] = entry
+                    self.reused += 1
+                    continue
+                entry = self._read_folder(folder.path, folder_mtime)
+                if entry is not None:
+                    entries[folder.path] = entry
+                    self.parsed += 1
+        self.entries = entries
+        self.by_id = { entry.id: entry for entry in entries.values() if entry.id }
+
+    def _read_folder(self, folder_path, folder_mtime):
+        with os.scandir(folder_path) as files:
+            manifest_path = next((f.path for f in files
+                                  if f.name.endswith('.manifest') and f.is_file()), None)
+        if manifest_path is None:
+            return None
+        signature = _file_signature(manifest_path)
+        try:
+            with open(manifest_path, encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            # Broken or removed during the scan
+            return None
+        return ManifestEntry(manifest_path, manifest, folder_mtime, signature)
@@ -0,0 +1,179 @@
+# Sampling profiler, with output for flame graph tools.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+import threading
+import time
+
+# Avoid Fusion namespace pollution
+from . import error
+from . import utils
+
+_THIS_FILE = os.path.abspath(__file__)
+
+class _Node:
+    __slots__ = ('count', 'children')
+
+    def __init__(self):
+        # Samples that ended in this node
+        self.count = 0
+        self.children = {}
+
+class SamplingProfiler:
+    '''
+    Low-overhead profiler that periodically samples the stack of the thread
+    that started it (normally Fusion's main thread) from a background thread.
+
+    Only frames from files in the given directories are kept, by default the
+    library and the add-in that created the profiler. File paths are shortened
+    with the same rules as error.ErrorCatcher.
+
+    Usage, e.g. in a command handler or together with an ErrorCatcher:
+
+        profiler = SamplingProfiler()
+        with error_catcher_, profiler:
+            slow_code()
+        profiler.write_collapsed('profile.txt')
+
+    The output is in the "collapsed stack" format, which is read by
+    flamegraph.pl, speedscope and similar tools.
+    '''
+    def __init__(self, interval=0.001, directories=None):
+        self.interval = interval
+        if directories is None:
+            directories = [os.path.dirname(utils.get_file_path()),
+                           os.path.dirname(utils.get_caller_path())]
+        self.directories = tuple(os.path.join(os.path.abspath(d), '') for d in directories)
+        self.root = _Node()
+        self.samples = 0
+        # Samples without any frames from the directories
+        self.other_samples = 0
+        self._labels = {}
+        self._file_included = {}
+        self._target_thread = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        self._target_thread = threading.get_ident()
+        self._running = True
+        self._thread = threading.Thread(target=self._run,
+                                        name='thomasa88lib sampling profiler',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def toggle(self):
+        '''Starts or stops the profiler, e.g. from a checkbox command.
+        Returns True if the profiler is running.'''
+        if self._running:
+            self.stop()
+        else:
+            self.start()
+        return self._running
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, etype, value, tb):
+        self.stop()
+
+    def clear(self):
+        self.root = _Node()
+        self.samples = 0
+        self.other_samples = 0
+
+    def collapsed(self):
+        '''Returns the samples as collapsed stacks: one line per stack,
+        with the frames separated by ";" and followed by the sample count.'''
+        lines = []
+        # Explicit stack, as the profiled code might be deeply recursive
+        stack = [(self.root, '')]
+        while stack:
+            node, path = stack.pop()
+            if node.count and path:
+                lines.append(f'{path} {node.count}')
+            for label, child in node.children.items():
+                stack.append((child, f'{path};{label}' if path else label))
+        if self.other_samples:
+            lines.append(f'(other) {self.other_samples}')
+        return '\n'.join(sorted(lines))
+
+    def write_collapsed(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed() + '\n')
+
+    def _run(self):
+        target = self._target_thread
+        while self._running:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                # Target thread has ended
+                return
+            self._sample(frame)
+
+    def _sample(self, frame):
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            if self._include(code.co_filename):
+                key = (code, frame.f_lineno)
+                label = self._labels.get(key)
+                if label is None:
+                    label = self._labels[key] = self._make_label(code, frame.f_lineno)
+                labels.append(label)
+            frame = frame.f_back
+        self.samples += 1
+        if not labels:
+            self.other_samples += 1
+            return
+        node = self.root
+        for label in reversed(labels):
+            child = node.children.get(label)
+            if child is None:
+                child = node.children[label] = _Node()
+            node = child
+        node.count += 1
+
+    def _include(self, filename):
+        included = self._file_included.get(filename)
+        if included is None:
+            path = os.path.abspath(filename)
+            # Skip the profiler's own frames, when it is started/stopped
+            included = path.startswith(self.directories) and path != _THIS_FILE
+            self._file_included[filename] = included
+        return included
+
+    def _make_label(self, code, lineno):
+        path = error.shorten_caller_path(os.path.abspath(code.co_filename))
+        return f'{code.co_name} ({path}:{lineno})'.replace(';', ',')
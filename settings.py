@@ -23,46 +23,470 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import contextlib
 import json
 import os
+import threading
+import time
 
 # Avoid Fusion namespace pollution
 from . import utils
 
+class JsonBackend:
+    '''Stores the settings as one JSON file, which is replaced on every write.
+
+    Backends are used in two steps, to keep the time spent holding the
+    settings lock short: serialize() runs with the settings locked and
+    store() runs without, but never concurrently with another store().
+    '''
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def load(self):
+        '''Returns the stored settings, or None if nothing has been stored.'''
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def serialize(self, settings, changed_keys):
+        '''changed_keys is None when all settings should be written.'''
+        return json.dumps(settings)
+
+    def store(self, payload):
+        utils.write_atomic(self.file_path, payload)
+
+    def close(self):
+        pass
+
+class JournalBackend:
+    '''Appends changed settings to a journal file, as JSON lines, instead of
+    rewriting all settings. Suitable for large settings.
+
+    The journal is compacted into the main JSON file in a background thread
+    when it grows past compact_bytes. The journal is first renamed to
+    <file>.journal.old, so that writes can continue in a new journal, and is
+    deleted when the main file has been replaced. Loading applies the main
+    file, the old journal (if a compaction was interrupted) and the journal.
+    '''
+    def __init__(self, file_path, compact_bytes=1024 * 1024):
+        self.file_path = file_path
+        self.journal_path = file_path + '.journal'
+        self.old_journal_path = self.journal_path + '.old'
+        self.compact_bytes = compact_bytes
+        self.compactions = 0
+        self._journal = None
+        self._journal_size = 0
+        self._settings = None
+        self._compactor = None
+
+    def load(self):
+        settings = None
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except FileNotFoundError:
+            pass
+        for path in (self.old_journal_path, self.journal_path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                continue
+            if settings is None:
+                settings = {}
+            for line in lines:
+                try:
+                    key, value = json.loads(line)
+                except ValueError:
+                    # Torn write at the end of the journal
+                    continue
+                settings[key] = value
+        return settings
+
+    def serialize(self, settings, changed_keys):
+        self._settings = settings
+        if changed_keys is None:
+            return (json.dumps(settings), None)
+        return (None, ''.join(json.dumps([key, settings[key]]) + '\n'
+                              for key in changed_keys))
+
+    def store(self, payload):
+        snapshot, lines = payload
+        if snapshot is not None:
+            self._wait_for_compaction()
+            utils.write_atomic(self.file_path, snapshot)
+            self._close_journal()
+            for path in (self.journal_path, self.old_journal_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._journal_size = 0
+            return
+        if not lines:
+            return
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_size = self._journal.tell()
+        self._journal.write(lines)
+        self._journal.flush()
+        # In bytes, as compact_bytes
+        self._journal_size = self._journal.tell()
+        if self._journal_size > self.compact_bytes and not self._compacting():
+            self._start_compaction()
+
+    def close(self):
+        self._wait_for_compaction()
+        self._close_journal()
+
+    def _close_journal(self):
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+    def _compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _start_compaction(self):
+        # The old journal must not be replaced before the last compaction
+        # has removed it
+        self._wait_for_compaction()
+        self._close_journal()
+        os.replace(self.journal_path, self.old_journal_path)
+        self._journal_size = 0
+        # Copying a dict is atomic, so no lock is needed
+        settings = dict(self._settings)
+        self._compactor = threading.Thread(target=self._compact, args=(settings,),
+                                           name='thomasa88lib settings compactor',
+                                           daemon=True)
+        self._compactor.start()
+
+    def _compact(self, settings):
+        utils.write_atomic(self.file_path, json.dumps(settings))
+        os.remove(self.old_journal_path)
+        self.compactions += 1
+
+    def _wait_for_compaction(self):
+        if self._compactor:
+            self._compactor.join()
+            self._compactor = None
+
+class SqliteBackend:
+    '''Stores the settings in an SQLite database, with one row per setting.
+    Only changed settings are written.'''
+    def __init__(self, file_path):
+        import sqlite3
+        self.file_path = file_path
+        # Writes can come from the flush timer thread. They are serialized
+        # by the settings manager.
+        self._db = sqlite3.connect(file_path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)')
+
+    def load(self):
+        rows = self._db.execute('SELECT key, value FROM settings').fetchall()
+        if not rows:
+            return None
+        return { key: json.loads(value) for key, value in rows }
+
+    def serialize(self, settings, changed_keys):
+        keys = settings.keys() if changed_keys is None else changed_keys
+        return [(key, json.dumps(settings[key])) for key in keys]
+
+    def store(self, payload):
+        with self._db:
+            self._db.executemany('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)',
+                                 payload)
+
+    def close(self):
+        self._db.close()
+
+class _PendingChanges:
+    '''Settings changed since the last write.'''
+    __slots__ = ('dirty', 'changed_keys')
+
+    def __init__(self):
+        self.dirty = False
+        self.changed_keys = set()
+
+class _SharedFile:
+    '''A settings file that is parsed once and shared by all SettingsManagers
+    in the process that use auto_reload for the same path.'''
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.settings = None
+        # Shared, as all managers change the same settings dict
+        self.pending = _PendingChanges()
+        # (mtime, size, inode) of the file when it was last read or written
+        self.signature = None
+        self.last_check = 0.0
+        # Incremented every time the file is re-read
+        self.version = 0
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+
+    def stat_signature(self):
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self):
+        '''Reads the file. Returns False if it does not exist.'''
+        signature = self.stat_signature()
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except FileNotFoundError:
+            return False
+        if self.settings is None:
+            self.settings = settings
+        else:
+            # Update in place, as the dict is shared by the managers
+            self.settings.clear()
+            self.settings.update(settings)
+        self.signature = signature
+        return True
+
+    def check(self, min_interval):
+        '''Re-reads the file if it has changed on disk. The file is only
+        checked once per min_interval seconds.'''
+        now = time.monotonic()
+        if now - self.last_check < min_interval:
+            return
+        self.last_check = now
+        signature = self.stat_signature()
+        if signature is None or signature == self.signature:
+            return
+        with self.lock:
+            if self.pending.dirty:
+                # Keep the unwritten changes of any manager. They will
+                # overwrite the file.
+                return
+            if self.load():
+                self.version += 1
+
+_shared_files = {}
+
 class SettingsManager:
-    def __init__(self, default_values, write_through=True, filename='settings.json'):
+    def __init__(self, default_values, write_through=True, filename='settings.json',
+                 flush_delay=0, auto_reload=False, reload_interval=1.0,
+                 backend=JsonBackend):
+        '''Loads settings from filename, in the directory of the calling file.
+
+        write_through: Write the file when a setting is changed.
+        flush_delay: Wait until no setting has been changed for this many
+                     seconds before writing, to combine many changes into one
+                     write. The write is done in a background thread. Call
+                     clean_up() when stopping, to write any pending changes.
+        auto_reload: Re-read the file when it has been changed by someone
+                     else. The file is checked with os.stat() on access, at
+                     most once per reload_interval seconds. All auto-reloading
+                     managers for the same file share one parsed copy.
+                     Unwritten changes are never replaced by a reload.
+                     Only supported with JsonBackend.
+        backend: Storage backend class, called with the file path. E.g.
+                 JournalBackend for large settings.
+        '''
         self.default_values = default_values
         self.write_through = write_through
+        self.flush_delay = flush_delay
         self.settings = None
 
         caller_file = utils.get_caller_path()
         caller_dir = os.path.dirname(caller_file)
         self.file_path = os.path.join(caller_dir, filename)
+        self.backend = backend(self.file_path)
+        if auto_reload and not isinstance(self.backend, JsonBackend):
+            raise ValueError('auto_reload is only supported with JsonBackend')
+
+        self.auto_reload = auto_reload
+        self.reload_interval = reload_interval
+        self._shared = None
+        self._seen_version = 0
+        self._change_callbacks = []
+        self._events_manager = None
+        self._poll_handle = None
+
+        if auto_reload:
+            self._shared = _shared_files.get(self.file_path)
+            if self._shared is None:
+                self._shared = _shared_files[self.file_path] = _SharedFile(self.file_path)
+            self._lock = self._shared.lock
+            self._write_lock = self._shared.write_lock
+            self._pending = self._shared.pending
+        else:
+            # Protects settings and the pending changes
+            self._lock = threading.RLock()
+            # Serializes file writes, so an older state never replaces a newer
+            self._write_lock = threading.Lock()
+            self._pending = _PendingChanges()
+        self._batch_depth = 0
+        self._flush_timer = None
+        self._flush_deadline = None
 
         self._read()
 
     def __getitem__(self, key):
+        if self._shared:
+            self.check_for_changes()
         try:
             return self.settings[key]
         except KeyError:
             return self.default_values[key]
 
     def get(self, key, default=None):
+        if self._shared:
+            self.check_for_changes()
         return self.settings.get(key, default)
 
     def __setitem__(self, key, value):
-        self.settings[key] = value
-        if self.write_through:
+        with self._lock:
+            self.settings[key] = value
+            self._pending.dirty = True
+            self._pending.changed_keys.add(key)
+        if self.write_through and not self._batch_depth:
+            self._changed()
+
+    @contextlib.contextmanager
+    def batch(self):
+        '''Defers writing until the end of the with block.
+
+        Usage:
+
+            with settings.batch():
+                settings['a'] = 1
+                settings['b'] = 2
+        '''
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._pending.dirty and self.write_through:
+                self._changed()
+
+    def flush(self):
+        '''Writes the settings, if they have been changed since the last write.'''
+        if self._pending.dirty:
             self.write()
 
-    def write(self):
-        with open(self.file_path, 'w+', encoding='utf-8') as f:
-            json.dump(self.settings, f)
+    def check_for_changes(self):
+        '''Re-reads the file if it has been changed on disk (with auto_reload).
+        Returns True if the settings changed since the last call.'''
+        shared = self._shared
+        shared.check(self.reload_interval)
+        if shared.version == self._seen_version:
+            return False
+        self._seen_version = shared.version
+        if self._events_manager:
+            for callback in self._change_callbacks:
+                self._events_manager.delay(lambda callback=callback: callback(self))
+        return True
+
+    def watch(self, events_manager, callback):
+        '''Calls callback(settings_manager) on the main thread, through
+        events_manager, when the file has been changed by someone else.
+        Requires auto_reload. The file is polled every reload_interval seconds,
+        until events_manager is cleaned up or unwatch() is called. Call watch()
+        again to continue with a new events manager.'''
+        if not self._shared:
+            raise ValueError('watch() requires auto_reload')
+        self._change_callbacks.append(callback)
+        poll_handle = self._poll_handle
+        # The poll is dropped when the events manager is cleaned up
+        if (events_manager is not self._events_manager or
+            poll_handle is None or not poll_handle.pending):
+            if poll_handle is not None:
+                poll_handle.cancel()
+            self._events_manager = events_manager
+            self._poll_handle = events_manager.delay(self._poll, self.reload_interval)
+
+    def unwatch(self, callback=None):
+        '''Stops calling callback, or all callbacks, on changes.'''
+        if callback:
+            self._change_callbacks.remove(callback)
+        else:
+            self._change_callbacks.clear()
+
+    def _poll(self):
+        if not self._change_callbacks:
+            self._poll_handle = None
+            return
+        self.check_for_changes()
+        self._poll_handle = self._events_manager.delay(self._poll, self.reload_interval)
+
+    def clean_up(self):
+        '''Cancels any delayed write and writes pending changes.'''
+        self.unwatch()
+        with self._lock:
+            timer = self._flush_timer
+            self._flush_timer = None
+        if timer:
+            timer.cancel()
+        self.flush()
+        self.backend.close()
+
+    def write(self, full=False):
+        '''Writes the changed settings, or all settings if full is True.
+        (JsonBackend always writes all settings.)'''
+        with self._write_lock:
+            with self._lock:
+                pending = self._pending
+                payload = self.backend.serialize(self.settings,
+                                                 None if full else pending.changed_keys)
+                pending.dirty = False
+                pending.changed_keys = set()
+            self.backend.store(payload)
+            if self._shared:
+                # Don't reload our own write
+                self._shared.signature = self._shared.stat_signature()
+
+    def _changed(self):
+        if self.flush_delay > 0:
+            self._schedule_flush()
+        else:
+            self.write()
+
+    def _schedule_flush(self):
+        with self._lock:
+            self._flush_deadline = time.monotonic() + self.flush_delay
+            if self._flush_timer is None:
+                self._start_flush_timer(self.flush_delay)
+
+    def _start_flush_timer(self, secs):
+        self._flush_timer = threading.Timer(secs, self._flush_timer_expired)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_timer_expired(self):
+        with self._lock:
+            if self._flush_timer is None:
+                # Cancelled
+                return
+            # Restart the timer if there were changes while it was running,
+            # instead of starting a new timer for every change.
+            remaining = self._flush_deadline - time.monotonic()
+            if remaining > 0:
+                self._start_flush_timer(remaining)
+                return
+            self._flush_timer = None
+        self.flush()
 
     def _read(self):
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.settings = json.load(f)
-        except FileNotFoundError:
+        if self._shared:
+            shared = self._shared
+            with self._lock:
+                if shared.settings is None and not shared.load():
+                    shared.settings = dict(self.default_values)
+                    self.settings = shared.settings
+                    self.write(full=True)
+                self.settings = shared.settings
+                self._seen_version = shared.version
+            return
+        self.settings = self.backend.load()
+        if self.settings is None:
             self.settings = self.default_values
-            self.write()
+            self.write(full=True)
@@ -0,0 +1,507 @@
+# Fake adsk.core: Application, custom events, user interface and command
+# definitions.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import queue
+import time
+
+# Simulated time per API call, in seconds. See set_call_latency().
+_call_latency = 0.0
+# Number of API calls made, for tests that check that calls are avoided
+api_calls = 0
+
+def set_call_latency(secs):
+    '''Makes every API call take secs seconds, to mimic the round-trip
+    into Fusion. Busy-waits, as sleep() is too coarse for microseconds.'''
+    global _call_latency
+    _call_latency = secs
+
+def _api_call():
+    global api_calls
+    api_calls += 1
+    if _call_latency:
+        end = time.perf_counter() + _call_latency
+        while time.perf_counter() < end:
+            pass
+
+def _api_property(attribute):
+    def get(self):
+        _api_call()
+        return getattr(self, attribute)
+    return property(get)
+
+class Base:
+    _class_type = 'adsk::core::Base'
+
+    @classmethod
+    def classType(cls):
+        return cls._class_type
+
+    @classmethod
+    def cast(cls, obj):
+        _api_call()
+        return obj if isinstance(obj, cls) else None
+
+    @property
+    def objectType(self):
+        return self._class_type
+
+    @property
+    def isValid(self):
+        _api_call()
+        return True
+
+class ListControlDisplayTypes:
+    CheckBoxListType = 0
+    RadioButtonlistType = 1
+    StandardListType = 2
+
+class DialogResults:
+    DialogError = -1
+    DialogOK = 0
+    DialogCancel = 1
+    DialogYes = 2
+    DialogNo = 3
+
+class EventHandler(Base):
+    _class_type = 'adsk::core::EventHandler'
+
+    def __init__(self):
+        pass
+
+    def notify(self, args):
+        raise NotImplementedError
+
+class CustomEventHandler(EventHandler):
+    _class_type = 'adsk::core::CustomEventHandler'
+
+class DocumentEventHandler(EventHandler):
+    _class_type = 'adsk::core::DocumentEventHandler'
+
+class ApplicationCommandEventHandler(EventHandler):
+    _class_type = 'adsk::core::ApplicationCommandEventHandler'
+
+class CommandCreatedEventHandler(EventHandler):
+    _class_type = 'adsk::core::CommandCreatedEventHandler'
+
+class EventArgs(Base):
+    _class_type = 'adsk::core::EventArgs'
+
+    def __init__(self, firing_event=None):
+        self.firingEvent = firing_event
+
+class CustomEventArgs(EventArgs):
+    _class_type = 'adsk::core::CustomEventArgs'
+
+    def __init__(self, firing_event=None, additional_info=''):
+        super().__init__(firing_event)
+        self.additionalInfo = additional_info
+
+class DocumentEventArgs(EventArgs):
+    _class_type = 'adsk::core::DocumentEventArgs'
+
+    def __init__(self, firing_event=None, document=None):
+        super().__init__(firing_event)
+        self.document = document
+
+class ApplicationCommandEventArgs(EventArgs):
+    _class_type = 'adsk::core::ApplicationCommandEventArgs'
+
+    def __init__(self, firing_event=None, command_id=''):
+        super().__init__(firing_event)
+        self.commandId = command_id
+
+class _NativeEvent:
+    '''The event inside "Fusion". Event objects are only wrappers around it.'''
+    def __init__(self, name, sender, event_class):
+        self.name = name
+        self.sender = sender
+        self.event_class = event_class
+        # Insertion ordered set of handlers
+        self.handlers = {}
+
+    def wrapper(self):
+        return self.event_class(self)
+
+    def fire(self, args):
+        args.firingEvent = self.wrapper()
+        for handler in list(self.handlers):
+            handler.notify(args)
+
+class Event(Base):
+    '''Like in Fusion, a new Event object is returned every time an event
+    property is read. All of them refer to the same native event.'''
+    _class_type = 'adsk::core::Event'
+    _handler_class = EventHandler
+
+    def __init__(self, native):
+        self._native = native
+
+    @property
+    def name(self):
+        _api_call()
+        return self._native.name
+
+    @property
+    def sender(self):
+        _api_call()
+        return self._native.sender
+
+    def add(self, handler):
+        _api_call()
+        if not isinstance(handler, self._handler_class):
+            raise TypeError(f'{type(handler).__name__} is not a {self._handler_class.__name__}')
+        self._native.handlers[handler] = None
+        return True
+
+    def remove(self, handler):
+        _api_call()
+        try:
+            del self._native.handlers[handler]
+        except KeyError:
+            return False
+        return True
+
+class CustomEvent(Event):
+    _class_type = 'adsk::core::CustomEvent'
+    _handler_class = CustomEventHandler
+
+    @property
+    def eventId(self):
+        return self._native.name
+
+class DocumentEvent(Event):
+    _class_type = 'adsk::core::DocumentEvent'
+    _handler_class = DocumentEventHandler
+
+class ApplicationCommandEvent(Event):
+    _class_type = 'adsk::core::ApplicationCommandEvent'
+    _handler_class = ApplicationCommandEventHandler
+
+class CommandCreatedEvent(Event):
+    _class_type = 'adsk::core::CommandCreatedEvent'
+    _handler_class = CommandCreatedEventHandler
+
+class ControlDefinition(Base):
+    _class_type = 'adsk::core::ControlDefinition'
+
+class ButtonControlDefinition(ControlDefinition):
+    _class_type = 'adsk::core::ButtonControlDefinition'
+
+class CheckBoxControlDefinition(ControlDefinition):
+    _class_type = 'adsk::core::CheckBoxControlDefinition'
+
+    def __init__(self, is_checked):
+        self.isChecked = is_checked
+
+class ListControlDefinition(ControlDefinition):
+    _class_type = 'adsk::core::ListControlDefinition'
+
+    def __init__(self, display_type):
+        self.listControlDisplayType = display_type
+
+class CommandDefinition(Base):
+    _class_type = 'adsk::core::CommandDefinition'
+
+    def __init__(self, store, cmd_id, name, tooltip, resource_folder, control_definition):
+        self._store = store
+        self._valid = True
+        self._id = cmd_id
+        self.name = name
+        self.tooltip = tooltip
+        self.resourceFolder = resource_folder
+        self._control_definition = control_definition
+        self._command_created = _NativeEvent('commandCreated', self, CommandCreatedEvent)
+
+    id = _api_property('_id')
+    controlDefinition = _api_property('_control_definition')
+
+    @property
+    def isValid(self):
+        _api_call()
+        return self._valid
+
+    @property
+    def commandCreated(self):
+        _api_call()
+        return self._command_created.wrapper()
+
+    def deleteMe(self):
+        _api_call()
+        if not self._valid:
+            raise RuntimeError('3 : object is not valid')
+        self._valid = False
+        del self._store.definitions[self._id]
+        return True
+
+class _CommandDefinitionStore:
+    def __init__(self):
+        # cmd_id -> CommandDefinition, in creation order
+        self.definitions = {}
+        # Call counts per CommandDefinitions method
+        self.calls = {}
+
+class CommandDefinitions(Base):
+    _class_type = 'adsk::core::CommandDefinitions'
+
+    def __init__(self, store):
+        self._store = store
+
+    def _count_call(self, name):
+        _api_call()
+        calls = self._store.calls
+        calls[name] = calls.get(name, 0) + 1
+
+    @property
+    def count(self):
+        self._count_call('count')
+        return len(self._store.definitions)
+
+    def item(self, index):
+        self._count_call('item')
+        definitions = list(self._store.definitions.values())
+        return definitions[index] if 0 <= index < len(definitions) else None
+
+    def itemById(self, cmd_id):
+        self._count_call('itemById')
+        return self._store.definitions.get(cmd_id)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        item = self.item(index)
+        if item is None:
+            raise IndexError(index)
+        return item
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.item(index)
+
+    def _add(self, method, cmd_id, name, tooltip, resource_folder, control_definition):
+        self._count_call(method)
+        if cmd_id in self._store.definitions:
+            raise RuntimeError(f'3 : Command definition {cmd_id} already exists')
+        cmd_def = CommandDefinition(self._store, cmd_id, name, tooltip,
+                                    resource_folder, control_definition)
+        self._store.definitions[cmd_id] = cmd_def
+        return cmd_def
+
+    def addButtonDefinition(self, cmd_id, name, tooltip, resourceFolder=''):
+        return self._add('addButtonDefinition', cmd_id, name, tooltip, resourceFolder,
+                         ButtonControlDefinition())
+
+    def addCheckBoxDefinition(self, cmd_id, name, tooltip, isChecked):
+        return self._add('addCheckBoxDefinition', cmd_id, name, tooltip, '',
+                         CheckBoxControlDefinition(isChecked))
+
+    def addListDefinition(self, cmd_id, name, listControlDisplayType, resourceFolder=''):
+        return self._add('addListDefinition', cmd_id, name, '', resourceFolder,
+                         ListControlDefinition(listControlDisplayType))
+
+class Workspace(Base):
+    _class_type = 'adsk::core::Workspace'
+
+    def __init__(self, workspace_id, resource_folder):
+        self.id = workspace_id
+        self.resourceFolder = resource_folder
+
+class Workspaces(Base):
+    _class_type = 'adsk::core::Workspaces'
+
+    def __init__(self):
+        self._workspaces = {
+            'FusionSolidEnvironment': Workspace('FusionSolidEnvironment',
+                                                '/fusion/UI/FusionUI/Resources/Environment/Model'),
+        }
+
+    def itemById(self, workspace_id):
+        _api_call()
+        return self._workspaces.get(workspace_id)
+
+class UserInterface(Base):
+    _class_type = 'adsk::core::UserInterface'
+
+    def __init__(self):
+        self._command_definitions = _CommandDefinitionStore()
+        self._workspaces = Workspaces()
+        self._command_starting = _NativeEvent('commandStarting', self, ApplicationCommandEvent)
+        self._command_terminated = _NativeEvent('commandTerminated', self, ApplicationCommandEvent)
+        # Texts of all message boxes shown. Not part of the Fusion API.
+        self.message_boxes = []
+
+    @property
+    def commandDefinitions(self):
+        _api_call()
+        return CommandDefinitions(self._command_definitions)
+
+    workspaces = _api_property('_workspaces')
+
+    @property
+    def commandStarting(self):
+        _api_call()
+        return self._command_starting.wrapper()
+
+    @property
+    def commandTerminated(self):
+        _api_call()
+        return self._command_terminated.wrapper()
+
+    def messageBox(self, text, title='', buttons=0, icon=0):
+        _api_call()
+        self.message_boxes.append(text)
+        return DialogResults.DialogOK
+
+class Product(Base):
+    _class_type = 'adsk::core::Product'
+
+class Document(Base):
+    _class_type = 'adsk::core::Document'
+
+    def __init__(self, name, product):
+        self.name = name
+        self._product = product
+
+    products = _api_property('_product')
+
+class Documents(Base):
+    _class_type = 'adsk::core::Documents'
+
+    def __init__(self):
+        self._documents = []
+
+    @property
+    def count(self):
+        _api_call()
+        return len(self._documents)
+
+    def item(self, index):
+        _api_call()
+        return self._documents[index]
+
+class Application(Base):
+    '''The fake Fusion application.
+
+    Custom events are queued by fireCustomEvent(), from any thread, and are
+    delivered on the thread that calls process_events(), which stands in for
+    Fusion's main thread. Built-in events are fired with fire_event().
+    process_events(), fire_event(), open_document() and reset() are not part
+    of the Fusion API.
+    '''
+    _class_type = 'adsk::core::Application'
+    _instance = None
+
+    @classmethod
+    def get(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        '''Drops the application, so that the next get() returns a new one.'''
+        cls._instance = None
+
+    def __init__(self):
+        self._user_interface = UserInterface()
+        self._documents = Documents()
+        self._active_product = None
+        self._custom_events = {}
+        self._queue = queue.Queue()
+        self._document_activated = _NativeEvent('documentActivated', self, DocumentEvent)
+        self._document_closed = _NativeEvent('documentClosed', self, DocumentEvent)
+        self._document_opened = _NativeEvent('documentOpened', self, DocumentEvent)
+        self.isStartupComplete = True
+
+    userInterface = _api_property('_user_interface')
+    documents = _api_property('_documents')
+    activeProduct = _api_property('_active_product')
+
+    @property
+    def version(self):
+        _api_call()
+        return '2.0.99999'
+
+    @property
+    def documentActivated(self):
+        _api_call()
+        return self._document_activated.wrapper()
+
+    @property
+    def documentClosed(self):
+        _api_call()
+        return self._document_closed.wrapper()
+
+    @property
+    def documentOpened(self):
+        _api_call()
+        return self._document_opened.wrapper()
+
+    def registerCustomEvent(self, event_id):
+        _api_call()
+        native = self._custom_events.get(event_id)
+        if native is None:
+            native = self._custom_events[event_id] = _NativeEvent(event_id, self, CustomEvent)
+        return native.wrapper()
+
+    def unregisterCustomEvent(self, event_id):
+        _api_call()
+        return self._custom_events.pop(event_id, None) is not None
+
+    def fireCustomEvent(self, event_id, additionalInfo=''):
+        _api_call()
+        if event_id not in self._custom_events:
+            return False
+        self._queue.put((event_id, additionalInfo))
+        return True
+
+    def process_events(self, timeout=0.0):
+        '''Delivers the custom events that have been fired. Waits up to timeout
+        seconds for the first event. Events fired by the handlers are left for
+        the next call, like Fusion runs them in a later turn of its event loop.
+        Returns the number of delivered events.'''
+        try:
+            first = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+        except queue.Empty:
+            return 0
+        pending = [first]
+        for _ in range(self._queue.qsize()):
+            pending.append(self._queue.get_nowait())
+        for event_id, additional_info in pending:
+            native = self._custom_events.get(event_id)
+            if native is not None:
+                native.fire(CustomEventArgs(additional_info=additional_info))
+        return len(pending)
+
+    def fire_event(self, event, args):
+        '''Fires a built-in event, such as documentActivated, right away.'''
+        event._native.fire(args)
+
+    def open_document(self, product, name='Untitled'):
+        '''Opens a document with the given product and makes it active.'''
+        self._documents._documents.append(Document(name, product))
+        self._active_product = product
+        self.fire_event(self.documentActivated, DocumentEventArgs())
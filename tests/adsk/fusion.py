@@ -0,0 +1,343 @@
+# Fake adsk.fusion: Design and a Timeline with groups.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from . import core
+from .core import _api_call, _api_property
+
+class DesignTypes:
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+class Feature(core.Base):
+    _class_type = 'adsk::fusion::Feature'
+
+    def __init__(self, entity_token):
+        self._entity_token = entity_token
+
+    entityToken = _api_property('_entity_token')
+
+class ExtrudeFeature(Feature):
+    _class_type = 'adsk::fusion::ExtrudeFeature'
+
+class Sketch(Feature):
+    _class_type = 'adsk::fusion::Sketch'
+
+class Occurrence(Feature):
+    _class_type = 'adsk::fusion::Occurrence'
+
+    @property
+    def bRepBodies(self):
+        _api_call()
+        return []
+
+class TimelineObject(core.Base):
+    _class_type = 'adsk::fusion::TimelineObject'
+
+    def __init__(self, timeline, name, entity):
+        self._timeline = timeline
+        self._name = name
+        self._entity = entity
+        self._suppressed = False
+        self._index = -1
+        self._parent_group = None
+
+    entity = _api_property('_entity')
+    parentGroup = _api_property('_parent_group')
+
+    @property
+    def name(self):
+        _api_call()
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        _api_call()
+        self._name = name
+
+    @property
+    def index(self):
+        _api_call()
+        return self._index
+
+    @property
+    def isGroup(self):
+        _api_call()
+        return False
+
+    @property
+    def isRolledBack(self):
+        _api_call()
+        return self._index >= self._timeline._marker
+
+    @property
+    def isSuppressed(self):
+        _api_call()
+        return self._suppressed
+
+    @isSuppressed.setter
+    def isSuppressed(self, suppressed):
+        _api_call()
+        if suppressed != self._suppressed:
+            self._suppressed = suppressed
+            self._timeline._changed_at(self._index)
+
+    def reorder(self, beforeIndex):
+        _api_call()
+        return self._timeline._reorder(self, beforeIndex)
+
+    def rollTo(self, rollBefore):
+        _api_call()
+        self._timeline.markerPosition = self._index if rollBefore else self._index + 1
+        return True
+
+class TimelineGroup(TimelineObject):
+    _class_type = 'adsk::fusion::TimelineGroup'
+
+    def __init__(self, timeline, name):
+        super().__init__(timeline, name, None)
+        self._collapsed = True
+
+    @property
+    def isGroup(self):
+        _api_call()
+        return True
+
+    @property
+    def index(self):
+        _api_call()
+        return self._first_index()
+
+    @property
+    def isCollapsed(self):
+        _api_call()
+        return self._collapsed
+
+    @isCollapsed.setter
+    def isCollapsed(self, collapsed):
+        _api_call()
+        self._collapsed = collapsed
+        self._timeline._top_level = None
+
+    @property
+    def count(self):
+        _api_call()
+        return len(self._children())
+
+    def item(self, index):
+        _api_call()
+        return self._children()[index]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.item(index)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.item(index)
+
+    def _children(self):
+        self._timeline._get_top_level()
+        return self._timeline._group_children[self]
+
+    def _first_index(self):
+        first = self._children()[0]
+        return first._first_index() if isinstance(first, TimelineGroup) else first._index
+
+class Timeline(core.Base):
+    '''Timeline with a recompute model: moving the marker forward and
+    changing suppression or order before the marker each count as one
+    recompute.
+
+    Groups can be nested. A collapsed group hides everything inside it,
+    at the top level. A group lists its direct children, groups or objects,
+    whether it is collapsed or not.
+
+    Not part of the Fusion API: add_object(), add_group(), recomputes and
+    marker_log (all values assigned to markerPosition).
+    '''
+    _class_type = 'adsk::fusion::Timeline'
+
+    def __init__(self):
+        # All objects, except groups, in timeline order
+        self._objects = []
+        self._marker = 0
+        # Objects shown at the top level, with collapsed groups
+        self._top_level = None
+        # Group -> objects and groups directly in the group, updated with
+        # _top_level
+        self._group_children = {}
+        self.recomputes = 0
+        self.marker_log = []
+
+    @property
+    def count(self):
+        _api_call()
+        return len(self._get_top_level())
+
+    def item(self, index):
+        _api_call()
+        return self._get_top_level()[index]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.item(index)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.item(index)
+
+    @property
+    def markerPosition(self):
+        _api_call()
+        return self._marker
+
+    @markerPosition.setter
+    def markerPosition(self, position):
+        _api_call()
+        self.marker_log.append(position)
+        if position > self._marker:
+            self.recomputes += 1
+        self._marker = position
+
+    def moveToEnd(self):
+        self.markerPosition = len(self._objects)
+
+    def add_object(self, name, entity=None):
+        at_end = self._marker == len(self._objects)
+        obj = TimelineObject(self, name, entity)
+        obj._index = len(self._objects)
+        self._objects.append(obj)
+        if at_end:
+            self._marker = len(self._objects)
+        self._top_level = None
+        return obj
+
+    def add_group(self, name, first_index, last_index, collapsed=True):
+        '''Groups the objects first_index to last_index. The range must not
+        cut through another group, but it can be inside or around one.'''
+        group = TimelineGroup(self, name)
+        group._collapsed = collapsed
+        parent = self._objects[first_index]._parent_group
+        for obj in self._objects[first_index:last_index + 1]:
+            # Move the outermost group or object below parent into the new group
+            while obj._parent_group is not parent:
+                obj = obj._parent_group
+            obj._parent_group = group
+        group._parent_group = parent
+        self._top_level = None
+        return group
+
+    def _get_top_level(self):
+        if self._top_level is None:
+            top_level = []
+            group_children = {}
+            # Group -> outermost collapsed group around and including it, or None
+            hidden_by = { None: None }
+
+            def get_hidden_by(group):
+                # Iterative, as groups can be nested very deep
+                chain = []
+                while group not in hidden_by:
+                    chain.append(group)
+                    group = group._parent_group
+                hider = hidden_by[group]
+                for group in reversed(chain):
+                    if hider is None and group._collapsed:
+                        hider = group
+                    hidden_by[group] = hider
+                return hider
+
+            def add_child(group, child):
+                # Iterative, for the same reason. Adds each group to its
+                # parent when its first object is seen.
+                while group is not None:
+                    children = group_children.get(group)
+                    is_new = children is None
+                    if is_new:
+                        children = group_children[group] = []
+                    if not children or children[-1] is not child:
+                        children.append(child)
+                    if not is_new:
+                        return
+                    child = group
+                    group = group._parent_group
+
+            for obj in self._objects:
+                add_child(obj._parent_group, obj)
+                item = get_hidden_by(obj._parent_group)
+                if item is None:
+                    item = obj
+                if not top_level or top_level[-1] is not item:
+                    top_level.append(item)
+            self._top_level = top_level
+            self._group_children = group_children
+        return self._top_level
+
+    def _changed_at(self, index):
+        if index < self._marker:
+            self.recomputes += 1
+
+    def _reorder(self, obj, before_index):
+        objects = self._objects
+        if not 0 <= before_index <= len(objects):
+            return False
+        target = objects[before_index] if before_index < len(objects) else None
+        if target is obj:
+            return True
+        old_index = obj._index
+        objects.remove(obj)
+        if target is None:
+            objects.append(obj)
+        else:
+            objects.insert(objects.index(target), obj)
+        for index, item in enumerate(objects):
+            item._index = index
+        self._top_level = None
+        self._changed_at(min(old_index, before_index))
+        return True
+
+class Design(core.Product):
+    _class_type = 'adsk::fusion::Design'
+
+    def __init__(self, design_type=DesignTypes.ParametricDesignType, timeline=None):
+        self._design_type = design_type
+        self._timeline = timeline if timeline is not None else Timeline()
+
+    designType = _api_property('_design_type')
+
+    @property
+    def timeline(self):
+        _api_call()
+        if self._design_type != DesignTypes.ParametricDesignType:
+            raise RuntimeError('2 : Direct designs have no timeline')
+        return self._timeline
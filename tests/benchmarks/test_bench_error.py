@@ -0,0 +1,56 @@
+# Benchmarks of ErrorCatcher.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from thomasa88lib import error
+
+def test_success_path(benchmark, app):
+    catcher = error.ErrorCatcher()
+
+    def no_error():
+        with catcher:
+            pass
+
+    benchmark(no_error)
+
+def test_success_path_baseline_try_except(benchmark):
+    # For comparison with test_success_path
+    def no_error():
+        try:
+            pass
+        except Exception:
+            pass
+
+    benchmark(no_error)
+
+def test_repeated_error(benchmark, app):
+    catcher = error.ErrorCatcher()
+
+    def repeated_error():
+        with catcher:
+            raise ValueError('failure')
+
+    repeated_error()
+    benchmark(repeated_error)
+    assert len(app.userInterface.message_boxes) == 1
@@ -0,0 +1,65 @@
+# Benchmarks of handler dispatch and delay().
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import adsk.core
+
+import harness
+
+def test_handler_dispatch(benchmark, events_manager, app):
+    calls = []
+    event = events_manager.register_event('bench_event')
+    events_manager.add_handler(event, callback=calls.append)
+    args = adsk.core.CustomEventArgs()
+    benchmark(app.fire_event, event, args)
+    assert calls
+
+def test_handler_dispatch_with_stats(benchmark, events_manager, app):
+    calls = []
+    event = events_manager.register_event('bench_event')
+    events_manager.add_handler(event, callback=calls.append)
+    events_manager.enable_stats()
+    args = adsk.core.CustomEventArgs()
+    benchmark(app.fire_event, event, args)
+    assert calls
+
+def test_delay_round_trip(benchmark, events_manager):
+    calls = []
+
+    def delay_100():
+        calls.clear()
+        for _ in range(100):
+            events_manager.delay(lambda: calls.append(None))
+        harness.process_pending()
+        assert len(calls) == 100
+
+    benchmark(delay_100)
+
+def test_delay_cancel(benchmark, events_manager):
+    def delay_and_cancel_100():
+        handles = [events_manager.delay(lambda: None, 10) for _ in range(100)]
+        for handle in handles:
+            handle.cancel()
+
+    benchmark(delay_and_cancel_100)
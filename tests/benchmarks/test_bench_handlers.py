@@ -0,0 +1,75 @@
+# Benchmarks of attaching and detaching many handlers.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import adsk.core
+
+COUNT = 10000
+
+def callback(args):
+    pass
+
+def make_callbacks():
+    def make(i):
+        def callback(args):
+            pass
+        callback.__name__ = f'callback{i}'
+        return callback
+    return [make(i) for i in range(COUNT)]
+
+def test_attach_detach_10k(benchmark, events_manager, app):
+    event = events_manager.register_event('bench_event')
+
+    def attach_detach():
+        handler_infos = [events_manager.add_handler(event, callback=callback)
+                         for _ in range(COUNT)]
+        for handler_info in handler_infos:
+            events_manager.remove_handler(handler_info)
+
+    benchmark.pedantic(attach_detach, rounds=3)
+    assert not events_manager.handlers
+
+def test_attach_detach_10k_distinct_callbacks(benchmark, events_manager, app):
+    event = events_manager.register_event('bench_event')
+    callbacks = make_callbacks()
+
+    def attach_detach():
+        handler_infos = [events_manager.add_handler(event, callback=c) for c in callbacks]
+        # Remove in reverse order, which was the worst case for list.remove()
+        for handler_info in reversed(handler_infos):
+            events_manager.remove_handler(handler_info)
+
+    benchmark.pedantic(attach_detach, rounds=3)
+    assert not events_manager.handlers
+
+def test_attach_10k_remove_by_key(benchmark, events_manager, app):
+    event = events_manager.register_event('bench_event')
+
+    def attach_remove_key():
+        for _ in range(COUNT):
+            events_manager.add_handler(event, callback=callback, key='bench')
+        events_manager.remove_key_handlers('bench')
+
+    benchmark.pedantic(attach_remove_key, rounds=3)
+    assert not events_manager.handlers
@@ -0,0 +1,105 @@
+# Benchmarks of settings writes.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+import pytest
+
+from thomasa88lib import settings
+
+DEFAULTS = { f'key{i}': i for i in range(200) }
+# Number of settings in the large settings benchmarks
+KEY_COUNTS = [10000, 100000]
+# Changes in the journal when loading
+JOURNAL_CHANGES = 10000
+
+@pytest.mark.parametrize('backend', [settings.JsonBackend, settings.JournalBackend,
+                                     settings.SqliteBackend])
+def test_settings_write_through(benchmark, tmp_path, backend):
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(tmp_path / 'settings'),
+                                       backend=backend)
+    counter = iter(range(10 ** 9))
+
+    def set_value():
+        manager['key0'] = next(counter)
+
+    benchmark(set_value)
+    manager.clean_up()
+
+@pytest.mark.parametrize('backend', [settings.JsonBackend, settings.JournalBackend])
+@pytest.mark.parametrize('key_count', KEY_COUNTS)
+def test_settings_write_through_large(benchmark, tmp_path, backend, key_count):
+    defaults = { f'key{i}': i for i in range(key_count) }
+    manager = settings.SettingsManager(defaults, filename=str(tmp_path / 'settings'),
+                                       backend=backend)
+    counter = iter(range(10 ** 9))
+
+    def set_value():
+        manager['key0'] = next(counter)
+
+    benchmark(set_value)
+    manager.clean_up()
+
+def _stored_settings(tmp_path, backend, key_count):
+    # Settings as left by an earlier session: the main file and, for the
+    # journal, JOURNAL_CHANGES changes not yet compacted
+    file_path = tmp_path / 'settings'
+    stored = { f'key{i}': i for i in range(key_count) }
+    file_path.write_text(json.dumps(stored), encoding='utf-8')
+    if backend is settings.JournalBackend:
+        with open(str(file_path) + '.journal', 'w', encoding='utf-8') as f:
+            for i in range(JOURNAL_CHANGES):
+                f.write(json.dumps([f'key{i % key_count}', -i]) + '\n')
+    return str(file_path)
+
+@pytest.mark.parametrize('backend', [settings.JsonBackend, settings.JournalBackend])
+@pytest.mark.parametrize('key_count', KEY_COUNTS)
+def test_settings_load(benchmark, tmp_path, backend, key_count):
+    file_path = _stored_settings(tmp_path, backend, key_count)
+
+    def load():
+        manager = settings.SettingsManager({}, filename=file_path, backend=backend)
+        manager.clean_up()
+        return manager
+
+    manager = benchmark(load)
+    assert len(manager.settings) == key_count
+
+def test_settings_batch_of_100(benchmark, tmp_path):
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(tmp_path / 'settings.json'))
+
+    def set_100():
+        with manager.batch():
+            for i in range(100):
+                manager[f'key{i}'] = i + 1
+
+    benchmark(set_100)
+    manager.clean_up()
+
+def test_settings_read(benchmark, tmp_path):
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(tmp_path / 'settings.json'),
+                                       auto_reload=True)
+    assert benchmark(manager.__getitem__, 'key5') == 5
+    manager.clean_up()
@@ -0,0 +1,289 @@
+# Benchmarks of timeline flattening, occurrence classification, snapshots
+# and diffs.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from array import array
+import random
+import time
+
+import pytest
+
+import adsk.core
+
+from thomasa88lib import apicache
+from thomasa88lib import timeline as tl
+
+import harness
+
+# Round-trip time per API call, in seconds
+LATENCIES = [0, 2e-6]
+
+@pytest.fixture
+def big_timeline():
+    return harness.build_timeline(2000, group_size=10, group_every=40, occurrence_every=7)
+
+# Number of objects in the large synthetic timelines
+SIZES = [10000, 100000]
+# More than the recursion limit, which the recursive flatten_timeline() hit
+NEST_DEPTH = 2000
+
+def _recursive_flatten_timeline(timeline_collection):
+    # flatten_timeline() before it was made non-recursive
+    flat_collection = []
+    for obj in timeline_collection:
+        if obj.isGroup:
+            flat_collection += _recursive_flatten_timeline(obj)
+        else:
+            flat_collection.append(obj)
+    return flat_collection
+
+def _sized_timeline(count):
+    return harness.build_timeline(count, group_size=10, group_every=40, occurrence_every=7)
+
+@pytest.mark.parametrize('latency', LATENCIES)
+@pytest.mark.parametrize('count', SIZES)
+def test_flatten_timeline(benchmark, app, count, latency):
+    timeline = _sized_timeline(count)
+    adsk.core.set_call_latency(latency)
+    flat = benchmark.pedantic(tl.flatten_timeline, args=(timeline,), rounds=3)
+    assert len(flat) == count
+
+@pytest.mark.parametrize('latency', LATENCIES)
+@pytest.mark.parametrize('count', SIZES)
+def test_iter_flat_timeline_before_marker(benchmark, app, count, latency):
+    timeline = _sized_timeline(count)
+    timeline.markerPosition = count // 10
+    adsk.core.set_call_latency(latency)
+    flat = benchmark(lambda: list(tl.iter_flat_timeline(timeline,
+                                                        stop=timeline.markerPosition)))
+    assert len(flat) == count // 10
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_flatten_deeply_nested_timeline(benchmark, app, latency):
+    timeline = harness.build_timeline(10000, nest_depth=NEST_DEPTH)
+    with pytest.raises(RecursionError):
+        _recursive_flatten_timeline(timeline)
+    adsk.core.set_call_latency(latency)
+    flat = benchmark.pedantic(tl.flatten_timeline, args=(timeline,), rounds=3)
+    assert [obj.name for obj in flat[:3]] == ['Sketch0', 'Extrude1', 'Extrude2']
+    assert len(flat) == 10000
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_classify_occurrences(benchmark, app, big_timeline, latency):
+    flat = tl.flatten_timeline(big_timeline)
+    adsk.core.set_call_latency(latency)
+    types = benchmark(lambda: [tl.get_occurrence_type(obj) for obj in flat])
+    assert types.count(tl.OCCURRENCE_COPY_COMP) > 0
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_classify_occurrences_cold(benchmark, app, big_timeline, latency):
+    flat = tl.flatten_timeline(big_timeline)
+    snapshot = tl.TimelineSnapshot.take(big_timeline)
+    adsk.core.set_call_latency(latency)
+    types, positions = benchmark(lambda: tl.OccurrenceClassifier().classify(flat, snapshot))
+    assert len(types) == 2000
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_classify_occurrences_cached(benchmark, app, big_timeline, latency):
+    flat = tl.flatten_timeline(big_timeline)
+    snapshot = tl.TimelineSnapshot.take(big_timeline)
+    classifier = tl.OccurrenceClassifier()
+    classifier.classify(flat, snapshot)
+    adsk.core.set_call_latency(latency)
+    types, positions = benchmark(classifier.classify, flat, snapshot)
+    assert len(types) == 2000
+
+def _best_time(func, rounds=3):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def test_cached_classification_beats_uncached(benchmark, app, big_timeline):
+    flat = tl.flatten_timeline(big_timeline)
+    snapshot = tl.TimelineSnapshot.take(big_timeline)
+    classifier = tl.OccurrenceClassifier()
+    adsk.core.set_call_latency(5e-6)
+
+    def uncached():
+        return [tl.get_occurrence_type(obj) for obj in flat]
+
+    uncached_time = _best_time(uncached)
+    cold_time = _best_time(lambda: tl.OccurrenceClassifier().classify(flat, snapshot))
+    classifier.classify(flat, snapshot)
+    warm_time = _best_time(lambda: classifier.classify(flat, snapshot))
+    benchmark.extra_info.update(uncached=uncached_time, cold=cold_time, warm=warm_time)
+    benchmark(classifier.classify, flat, snapshot)
+    assert warm_time < uncached_time / 2
+    assert cold_time < uncached_time
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_flatten_and_classify_with_read_scope(benchmark, app, big_timeline, latency):
+    adsk.core.set_call_latency(latency)
+
+    def flatten_and_classify():
+        with apicache.ReadScope() as scope:
+            flat = tl.flatten_timeline(big_timeline, read_scope=scope)
+            return [tl.get_occurrence_type(obj, read_scope=scope) for obj in flat]
+
+    types = benchmark(flatten_and_classify)
+    assert len(types) == 2000
+
+# Lookups per round in the index benchmarks
+LOOKUPS = 10
+
+def _lookup_tokens(count):
+    return [f'token{i}' for i in random.Random(1).sample(range(count), LOOKUPS)]
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_lookup_by_linear_scan(benchmark, app, latency):
+    timeline = _sized_timeline(SIZES[0])
+    tokens = _lookup_tokens(SIZES[0])
+    adsk.core.set_call_latency(latency)
+
+    def scan():
+        return [next(obj for obj in tl.iter_flat_timeline(timeline)
+                     if obj.entity.entityToken == token)
+                for token in tokens]
+
+    objs = benchmark.pedantic(scan, rounds=3)
+    assert len(objs) == LOOKUPS
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_lookup_by_index_including_build(benchmark, app, latency):
+    timeline = _sized_timeline(SIZES[0])
+    tokens = _lookup_tokens(SIZES[0])
+    index = tl.TimelineIndex(timeline=timeline)
+    adsk.core.set_call_latency(latency)
+
+    def build_and_look_up():
+        index.invalidate()
+        return [index.get_by_token(token) for token in tokens]
+
+    objs = benchmark.pedantic(build_and_look_up, rounds=3)
+    assert None not in objs
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_lookup_by_built_index(benchmark, app, latency):
+    timeline = _sized_timeline(SIZES[0])
+    tokens = _lookup_tokens(SIZES[0])
+    index = tl.TimelineIndex(timeline=timeline)
+    index.build()
+    adsk.core.set_call_latency(latency)
+    objs = benchmark(lambda: [index.get_by_token(token) for token in tokens])
+    assert None not in objs
+    assert index.builds == 1
+
+# Passes over the timeline, e.g. to build several views of it
+PASSES = 3
+# A cached read costs about a microsecond, so the scope only pays off
+# with slower API calls
+SCOPE_LATENCIES = LATENCIES + [2e-5]
+
+def _timeline_pass(flat, read_scope=None):
+    return [(obj.name, obj.isSuppressed, tl.get_occurrence_type(obj, read_scope=read_scope))
+            for obj in flat]
+
+@pytest.mark.parametrize('latency', SCOPE_LATENCIES)
+def test_passes_without_read_scope(benchmark, app, big_timeline, latency):
+    adsk.core.set_call_latency(latency)
+
+    def passes():
+        return [_timeline_pass(tl.flatten_timeline(big_timeline)) for _ in range(PASSES)]
+
+    results = benchmark.pedantic(passes, rounds=3)
+    assert len(results[-1]) == 2000
+
+@pytest.mark.parametrize('latency', SCOPE_LATENCIES)
+def test_passes_with_read_scope(benchmark, app, big_timeline, latency):
+    adsk.core.set_call_latency(latency)
+
+    def passes():
+        with apicache.ReadScope() as scope:
+            return [_timeline_pass(tl.flatten_timeline(big_timeline, read_scope=scope), scope)
+                    for _ in range(PASSES)]
+
+    results = benchmark.pedantic(passes, rounds=3)
+    assert len(results[-1]) == 2000
+
+def _synthetic_snapshot(count):
+    names = [f'Feature{i}' for i in range(count)]
+    tokens = [f'token{i}' for i in range(count)]
+    return tl.TimelineSnapshot(names, tokens, array('b', [0] * count),
+                               array('b', [0] * count), array('l', range(count)))
+
+def test_take_snapshot(benchmark, app, big_timeline):
+    snapshot = benchmark(tl.TimelineSnapshot.take, big_timeline)
+    assert len(snapshot) == 2050
+
+@pytest.mark.parametrize('count', [1000, 10000])
+def test_diff_unchanged(benchmark, count):
+    old = _synthetic_snapshot(count)
+    new = _synthetic_snapshot(count)
+    assert not benchmark(old.diff, new)
+
+@pytest.mark.parametrize('count', [1000, 10000])
+def test_diff_renames_and_suppressions(benchmark, count):
+    old = _synthetic_snapshot(count)
+    new = _synthetic_snapshot(count)
+    for i in range(0, count, 10):
+        new.names[i] = f'Renamed{i}'
+        new.suppressed[i + 1] = 1
+    diff = benchmark(old.diff, new)
+    assert len(diff.renamed) == count // 10
+
+@pytest.mark.parametrize('count', [1000, 10000])
+def test_diff_shuffled(benchmark, count):
+    old = _synthetic_snapshot(count)
+    order = list(range(count))
+    random.Random(1).shuffle(order)
+    new = tl.TimelineSnapshot([old.names[i] for i in order], [old.tokens[i] for i in order],
+                              array('b', [0] * count), array('b', [0] * count),
+                              array('l', range(count)))
+    diff = benchmark(old.diff, new)
+    assert diff.moved
+
+def test_snapshot_json_round_trip(benchmark):
+    snapshot = _synthetic_snapshot(10000)
+    loaded = benchmark(lambda: tl.TimelineSnapshot.from_json(snapshot.to_json()))
+    assert len(loaded) == 10000
+
+@pytest.mark.parametrize('latency', LATENCIES)
+def test_batch_rename_and_suppress(benchmark, app, latency):
+    timeline = harness.build_timeline(2000)
+    objs = list(timeline)
+    adsk.core.set_call_latency(latency)
+
+    def rename_and_suppress():
+        batch = tl.TimelineBatch(timeline)
+        for i, obj in enumerate(objs):
+            batch.rename(obj, f'Feature{i}')
+            if i % 20 == 0:
+                batch.suppress(obj, not obj.isSuppressed)
+        batch.apply()
+
+    benchmark(rename_and_suppress)
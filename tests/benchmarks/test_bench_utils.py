@@ -0,0 +1,54 @@
+# Benchmarks of the caller path lookup.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import inspect
+import os
+
+import pytest
+
+from thomasa88lib import utils
+
+# Frames on the stack when an add-in callback runs inside Fusion,
+# roughly: event dispatch, library handler, add-in code
+STACK_DEPTH = 30
+
+def _stack_get_caller_path():
+    # get_caller_path() before it walked the frames itself
+    return os.path.abspath(inspect.stack()[2][1])
+
+def _library_function(lookup):
+    # Like ErrorCatcher or SettingsManager, which look up their caller
+    return lookup()
+
+def _at_depth(depth, func):
+    if depth > 0:
+        return _at_depth(depth - 1, func)
+    return func()
+
+@pytest.mark.parametrize('lookup', [utils.get_caller_path, _stack_get_caller_path],
+                         ids=['frame_walk', 'inspect_stack'])
+def test_get_caller_path(benchmark, lookup):
+    path = benchmark(_at_depth, STACK_DEPTH, lambda: _library_function(lookup))
+    assert path == os.path.abspath(__file__)
@@ -0,0 +1,57 @@
+# Compares two benchmark result files.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+'''Compares two benchmark JSON files, written with --benchmark-json.
+
+Usage: python compare_benchmarks.py old.json new.json
+'''
+import json
+import sys
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('commit_info', {}).get('id'), { bench['fullname']: bench['stats']
+                                                    for bench in data['benchmarks'] }
+
+def main(old_path, new_path):
+    old_commit, old = load(old_path)
+    new_commit, new = load(new_path)
+    print(f'old: {old_commit}')
+    print(f'new: {new_commit}')
+    print(f'{"benchmark":70} {"old [us]":>10} {"new [us]":>10} {"change":>8}')
+    for name in sorted(old.keys() | new.keys()):
+        if name not in old or name not in new:
+            print(f'{name:70} {"only in " + ("new" if name in new else "old"):>30}')
+            continue
+        old_time = old[name]['median']
+        new_time = new[name]['median']
+        change = (new_time - old_time) / old_time * 100
+        print(f'{name:70} {old_time * 1e6:10.2f} {new_time * 1e6:10.2f} {change:+7.1f}%')
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    main(*sys.argv[1:])
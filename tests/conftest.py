@@ -0,0 +1,187 @@
+# pytest configuration: loads the library as the thomasa88lib package, with
+# the fake adsk package, and provides a fallback for the pytest-benchmark
+# plugin.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.dirname(TESTS_DIR)
+
+# The fake adsk package
+sys.path.insert(0, TESTS_DIR)
+
+def _load_library():
+    # Add-ins use the library as a package named thomasa88lib,
+    # whatever the name of the checkout directory.
+    spec = importlib.util.spec_from_file_location('thomasa88lib',
+                                                  os.path.join(LIB_DIR, '__init__.py'),
+                                                  submodule_search_locations=[LIB_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['thomasa88lib'] = module
+    spec.loader.exec_module(module)
+
+_load_library()
+
+import adsk.core
+
+@pytest.fixture
+def app():
+    '''A new fake Application, without API call latency.'''
+    adsk.core.Application.reset()
+    adsk.core.set_call_latency(0)
+    yield adsk.core.Application.get()
+    adsk.core.set_call_latency(0)
+    adsk.core.Application.reset()
+
+@pytest.fixture
+def events_manager(app):
+    from thomasa88lib import events
+    manager = events.EventsManager()
+    yield manager
+    manager.clean_up()
+
+# Minimal stand-in for the pytest-benchmark plugin, with the same fixture
+# and options, so that the suite runs without it.
+
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+_benchmark_results = []
+
+class _Benchmark:
+    def __init__(self, node, max_time, disabled):
+        self.name = node.name
+        self.fullname = node.nodeid
+        self.max_time = max_time
+        self.disabled = disabled
+        self.extra_info = {}
+
+    def __call__(self, func, *args, **kwargs):
+        if self.disabled:
+            return func(*args, **kwargs)
+        # Warm-up, and a first estimate of the time per call
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        estimate = max(time.perf_counter() - start, 1e-7)
+        # Several calls per round for fast functions, to measure more than the timer
+        iterations = max(1, int(1e-4 / estimate))
+        rounds = min(max(5, int(self.max_time / (estimate * iterations))), 100000)
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = func(*args, **kwargs)
+            times.append((time.perf_counter() - start) / iterations)
+        self._store(times, iterations)
+        return result
+
+    def pedantic(self, target, args=(), kwargs=None, setup=None, rounds=1,
+                 iterations=1, warmup_rounds=0):
+        kwargs = kwargs or {}
+        if self.disabled:
+            rounds = 1
+            warmup_rounds = 0
+        times = []
+        for i in range(warmup_rounds + rounds):
+            if setup:
+                setup_result = setup()
+                if setup_result is not None:
+                    args, kwargs = setup_result
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = target(*args, **kwargs)
+            if i >= warmup_rounds:
+                times.append((time.perf_counter() - start) / iterations)
+        if not self.disabled:
+            self._store(times, iterations)
+        return result
+
+    def _store(self, times, iterations):
+        _benchmark_results.append({
+            'name': self.name,
+            'fullname': self.fullname,
+            'extra_info': self.extra_info,
+            'stats': {
+                'min': min(times),
+                'max': max(times),
+                'mean': statistics.mean(times),
+                'stddev': statistics.stdev(times) if len(times) > 1 else 0.0,
+                'median': statistics.median(times),
+                'rounds': len(times),
+                'iterations': iterations,
+            },
+        })
+
+if pytest_benchmark is None:
+    def pytest_addoption(parser):
+        group = parser.getgroup('benchmark')
+        group.addoption('--benchmark-json', metavar='PATH',
+                        help='Write the benchmark results to PATH as JSON.')
+        group.addoption('--benchmark-max-time', type=float, default=0.25,
+                        help='Maximum run time per benchmark, in seconds. Default: 0.25')
+        group.addoption('--benchmark-disable', action='store_true',
+                        help='Run each benchmark once, without timing.')
+
+    @pytest.fixture
+    def benchmark(request):
+        config = request.config
+        return _Benchmark(request.node, config.getoption('benchmark_max_time'),
+                          config.getoption('benchmark_disable'))
+
+    def pytest_sessionfinish(session):
+        path = session.config.getoption('benchmark_json')
+        if not path:
+            return
+        try:
+            commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=LIB_DIR,
+                                    capture_output=True, text=True).stdout.strip()
+        except OSError:
+            commit = None
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'machine_info': {
+                    'node': platform.node(),
+                    'machine': platform.machine(),
+                    'system': platform.system(),
+                    'python_implementation': platform.python_implementation(),
+                    'python_version': platform.python_version(),
+                },
+                'commit_info': { 'id': commit },
+                'benchmarks': _benchmark_results,
+                'datetime': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            }, f, indent=2)
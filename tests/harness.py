@@ -0,0 +1,86 @@
+# Helpers for running the library against the fake adsk package.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+
+import adsk.core
+import adsk.fusion
+
+def run_until(predicate, timeout=2.0):
+    '''Delivers custom events, like Fusion's main thread, until predicate()
+    is true. Returns False if timeout seconds pass first.'''
+    app = adsk.core.Application.get()
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        app.process_events(0.005)
+    return True
+
+def process_pending(max_rounds=1000):
+    '''Delivers custom events until no more are fired.'''
+    app = adsk.core.Application.get()
+    for _ in range(max_rounds):
+        if not app.process_events():
+            return
+
+def build_timeline(count, group_size=0, group_every=0, occurrence_every=0, nest_depth=0):
+    '''Builds a synthetic timeline with count objects.
+
+    group_size, group_every: Put group_size objects in a collapsed group at
+                             every group_every objects.
+    occurrence_every: Make every occurrence_every object a component
+                      occurrence. Every other occurrence is a copy.
+    nest_depth: Put the first nest_depth objects in collapsed groups inside
+                each other. Group n holds objects n to nest_depth - 1.
+    '''
+    timeline = adsk.fusion.Timeline()
+    occurrences = 0
+    for i in range(count):
+        token = f'token{i}'
+        if occurrence_every and i % occurrence_every == 0:
+            occurrences += 1
+            entity = adsk.fusion.Occurrence(token)
+            prefix = 'CopyPaste ' if occurrences % 2 == 0 else ''
+            name = f'{prefix}Component{occurrences}:1'
+        elif i % 3 == 0:
+            entity = adsk.fusion.Sketch(token)
+            name = f'Sketch{i}'
+        else:
+            entity = adsk.fusion.ExtrudeFeature(token)
+            name = f'Extrude{i}'
+        timeline.add_object(name, entity)
+    if group_size and group_every:
+        for first in range(0, count - group_size + 1, group_every):
+            timeline.add_group(f'Group{first}', first, first + group_size - 1)
+    for level in range(nest_depth):
+        timeline.add_group(f'Nested{level}', level, nest_depth - 1)
+    return timeline
+
+def open_design(timeline):
+    '''Opens a parametric design with the timeline in the fake application.'''
+    design = adsk.fusion.Design(timeline=timeline)
+    adsk.core.Application.get().open_document(design)
+    return design
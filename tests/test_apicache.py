@@ -0,0 +1,93 @@
+# Tests of ReadScope and CachedProxy.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import adsk.core
+
+from thomasa88lib import apicache
+
+import harness
+
+def test_reads_are_cached_within_scope():
+    timeline = harness.build_timeline(10)
+    with apicache.ReadScope() as scope:
+        wrapped = scope.wrap(timeline)
+        names = [obj.name for obj in wrapped]
+        before = adsk.core.api_calls
+        assert [obj.name for obj in wrapped] == names
+        assert wrapped.item(3).name == 'Sketch3'
+        assert wrapped.markerPosition == 10
+        assert wrapped.markerPosition == 10
+        # Only item(3), the first time, and the first markerPosition read
+        # go to Fusion. The item proxy is the same as when iterating.
+        assert adsk.core.api_calls - before == 2
+        assert wrapped.item(3) is wrapped.item(3)
+        assert adsk.core.api_calls - before == 2
+        assert scope.hits > 0
+
+def test_modifying_methods_are_not_cached():
+    timeline = harness.build_timeline(10)
+    with apicache.ReadScope() as scope:
+        wrapped = scope.wrap(timeline)
+        wrapped.item(3).rollTo(True)
+        wrapped.moveToEnd()
+        wrapped.item(3).rollTo(True)
+        wrapped.moveToEnd()
+    assert timeline.marker_log == [3, 10, 3, 10]
+    assert timeline.markerPosition == 10
+
+def test_method_calls_invalidate_the_scope():
+    timeline = harness.build_timeline(10)
+    with apicache.ReadScope() as scope:
+        wrapped = scope.wrap(timeline)
+        assert wrapped.markerPosition == 10
+        wrapped.item(3).rollTo(True)
+        assert wrapped.markerPosition == 3
+        assert wrapped.item(5).isRolledBack
+
+def test_setting_attributes_invalidates_the_scope():
+    timeline = harness.build_timeline(10)
+    with apicache.ReadScope() as scope:
+        obj = scope.wrap(timeline).item(2)
+        assert obj.name == 'Extrude2'
+        obj.name = 'Renamed'
+        assert obj.name == 'Renamed'
+
+def test_command_terminated_invalidates_the_scope(events_manager, app):
+    timeline = harness.build_timeline(10)
+    with apicache.ReadScope(events_manager) as scope:
+        wrapped = scope.wrap(timeline)
+        assert wrapped.markerPosition == 10
+        timeline.markerPosition = 4
+        assert wrapped.markerPosition == 10
+        app.fire_event(app.userInterface.commandTerminated,
+                       adsk.core.ApplicationCommandEventArgs())
+        assert wrapped.markerPosition == 4
+    assert not events_manager.handlers
+
+def test_unwrap():
+    timeline = harness.build_timeline(1)
+    with apicache.ReadScope() as scope:
+        assert apicache.unwrap(scope.wrap(timeline)) is timeline
+        assert apicache.unwrap(timeline) is timeline
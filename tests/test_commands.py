@@ -0,0 +1,69 @@
+# Tests of CommandRegistry.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+import adsk.core
+
+from thomasa88lib import commands
+
+def make_registry(tmp_path):
+    registry = commands.CommandRegistry(filename=str(tmp_path / 'command_ids.json'))
+    registry.add_checkbox('testToggle', 'Toggle', 'Toggles', True)
+    registry.add_button('testRun', 'Run', 'Runs')
+    registry.add_list('testList', 'List', adsk.core.ListControlDisplayTypes.StandardListType)
+    return registry
+
+def test_create_and_delete_all(app, tmp_path):
+    registry = make_registry(tmp_path)
+    cmd_defs = registry.create()
+    store = app.userInterface._command_definitions
+    assert list(store.definitions) == ['testToggle', 'testRun', 'testList']
+    assert cmd_defs['testToggle'].controlDefinition.isChecked
+    assert json.loads((tmp_path / 'command_ids.json').read_text()) == list(store.definitions)
+    assert set(registry.timings) == { 'load', 'delete_stale', 'create', 'save' }
+
+    registry.delete_all()
+    assert not store.definitions
+    assert json.loads((tmp_path / 'command_ids.json').read_text()) == []
+
+def test_create_twice_recreates(app, tmp_path):
+    registry = make_registry(tmp_path)
+    first = registry.create()
+    second = registry.create()
+    assert not first['testRun'].isValid
+    assert second['testRun'].isValid
+
+def test_stale_definitions_are_deleted_without_scan(app, tmp_path):
+    # Left behind by a session that crashed
+    cmd_defs = app.userInterface.commandDefinitions
+    cmd_defs.addButtonDefinition('oldCommand', 'Old', '')
+    (tmp_path / 'command_ids.json').write_text(json.dumps(['oldCommand']))
+
+    registry = make_registry(tmp_path)
+    registry.create()
+    store = app.userInterface._command_definitions
+    assert 'oldCommand' not in store.definitions
+    assert 'item' not in store.calls and 'count' not in store.calls
@@ -0,0 +1,88 @@
+# Tests of ErrorCatcher.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+from thomasa88lib import error
+
+def fail(catcher, message='failure'):
+    # Same file and line every time
+    with catcher:
+        raise ValueError(message)
+
+def test_error_is_caught_and_shown(app):
+    catcher = error.ErrorCatcher(msg_prefix='Test')
+    fail(catcher)
+    assert len(app.userInterface.message_boxes) == 1
+    assert 'Test error: failure' in app.userInterface.message_boxes[0]
+
+def test_no_error(app):
+    catcher = error.ErrorCatcher()
+    with catcher:
+        pass
+    assert app.userInterface.message_boxes == []
+
+def test_repeats_are_deduplicated(app):
+    catcher = error.ErrorCatcher()
+    for _ in range(5):
+        fail(catcher)
+    assert len(app.userInterface.message_boxes) == 1
+    assert list(catcher.error_counts.values()) == [5]
+
+def test_repeat_after_quiet_period_is_shown_again(app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(error.time, 'monotonic', lambda: now[0])
+    catcher = error.ErrorCatcher(dedupe_secs=60, msgbox_refill_secs=1)
+    fail(catcher)
+    now[0] += 30
+    fail(catcher)
+    assert len(app.userInterface.message_boxes) == 1
+    now[0] += 61
+    fail(catcher)
+    assert len(app.userInterface.message_boxes) == 2
+
+def test_dedupe_can_be_disabled(app):
+    catcher = error.ErrorCatcher(dedupe=False, msgbox_burst=10)
+    for _ in range(3):
+        fail(catcher)
+    assert len(app.userInterface.message_boxes) == 3
+
+def test_message_boxes_are_rate_limited(app):
+    catcher = error.ErrorCatcher(dedupe=False, msgbox_burst=2, msgbox_refill_secs=1000)
+    for _ in range(5):
+        fail(catcher)
+    assert len(app.userInterface.message_boxes) == 2
+    assert catcher.suppressed_msgboxes == 3
+
+def test_errors_are_logged(app, tmp_path):
+    log_path = tmp_path / 'errors.log'
+    catcher = error.ErrorCatcher(log_path=str(log_path))
+    fail(catcher, 'first')
+    fail(catcher, 'second')
+    catcher.close()
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [record['message'] for record in records] == ['first', 'second']
+    assert [record['count'] for record in records] == [1, 2]
+    assert records[0]['type'] == 'ValueError'
@@ -0,0 +1,112 @@
+# Tests of EventsManager handlers and delay().
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import adsk.core
+
+from thomasa88lib import events
+
+import harness
+
+def handler_count(event):
+    return len(event._native.handlers)
+
+def test_handler_calls_callback(events_manager, app):
+    calls = []
+    events_manager.add_handler(app.documentActivated, callback=calls.append)
+    app.fire_event(app.documentActivated, adsk.core.DocumentEventArgs())
+    assert len(calls) == 1
+
+def test_handler_errors_are_caught(events_manager, app):
+    def failing(args):
+        raise ValueError('handler failed')
+
+    events_manager.add_handler(app.documentActivated, callback=failing)
+    app.fire_event(app.documentActivated, adsk.core.DocumentEventArgs())
+    assert any('handler failed' in text for text in app.userInterface.message_boxes)
+
+def test_remove_handler(events_manager, app):
+    handler_info = events_manager.add_handler(app.documentActivated, callback=print)
+    events_manager.remove_handler(handler_info)
+    assert handler_count(app.documentActivated) == 0
+    assert not events_manager.handlers
+    assert not events_manager.handlers_by_callback
+
+def test_remove_key_handlers_with_new_event_object(events_manager, app):
+    # app.documentActivated gives a new object on every read
+    events_manager.add_handler(app.documentActivated, callback=print, key='doc')
+    events_manager.add_handler(app.documentClosed, callback=print, key='doc')
+    events_manager.add_handler(app.documentOpened, callback=print)
+    events_manager.remove_key_handlers('doc')
+    assert handler_count(app.documentActivated) == 0
+    assert handler_count(app.documentClosed) == 0
+    assert handler_count(app.documentOpened) == 1
+    assert not events_manager.handlers_by_key
+
+def test_remove_callback_handlers(events_manager, app):
+    events_manager.add_handler(app.documentActivated, callback=print)
+    events_manager.add_handler(app.documentClosed, callback=print)
+    events_manager.add_handler(app.documentClosed, callback=repr)
+    events_manager.remove_callback_handlers(print)
+    assert handler_count(app.documentActivated) == 0
+    assert handler_count(app.documentClosed) == 1
+
+def test_handler_classes_are_reused(events_manager, app):
+    first = events_manager.add_handler(app.documentActivated, callback=print)
+    second = events_manager.add_handler(app.documentClosed, callback=print)
+    assert type(first[0]) is type(second[0])
+    assert len(events_manager.handler_classes) == 1
+
+def test_delay(events_manager):
+    calls = []
+    events_manager.delay(lambda: calls.append('now'))
+    events_manager.delay(lambda: calls.append('later'), 0.01)
+    assert harness.run_until(lambda: len(calls) == 2)
+    assert calls == ['now', 'later']
+
+def test_delay_cancel(events_manager):
+    calls = []
+    handle = events_manager.delay(lambda: calls.append(None), 0.01)
+    assert handle.cancel()
+    assert not handle.pending
+    harness.run_until(lambda: False, timeout=0.05)
+    assert calls == []
+
+def test_clean_up_removes_handlers_and_events(app):
+    manager = events.EventsManager()
+    manager.add_handler(app.documentActivated, callback=print)
+    manager.delay(lambda: None)
+    manager.clean_up()
+    assert handler_count(app.documentActivated) == 0
+    assert not app._custom_events
+
+def test_policy_stats_adds_up_handlers_with_the_same_name(events_manager, app):
+    event = events_manager.register_event('policy_event')
+    events_manager.add_handler(event, callback=lambda args: None, coalesce=True)
+    events_manager.add_handler(event, callback=lambda args: None, coalesce=True)
+    for _ in range(3):
+        app.fireCustomEvent('policy_event')
+    harness.process_pending()
+    assert events_manager.policy_stats() == {
+        'CustomEventHandler_<lambda>': { 'calls': 6, 'runs': 2, 'merged': 4 } }
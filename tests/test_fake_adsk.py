@@ -0,0 +1,94 @@
+# Tests of the fake adsk package itself.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+
+import adsk.core
+import adsk.fusion
+
+import harness
+
+def test_event_property_returns_new_wrapper(app):
+    # Like Fusion. The library must not rely on the identity of event objects.
+    assert app.documentActivated is not app.documentActivated
+
+def test_custom_events_are_delivered_on_the_processing_thread(app):
+    event = app.registerCustomEvent('test_event')
+    received = []
+
+    class Handler(adsk.core.CustomEventHandler):
+        def notify(self, args):
+            received.append((args.additionalInfo, threading.get_ident()))
+
+    event.add(Handler())
+    thread = threading.Thread(target=app.fireCustomEvent, args=('test_event', 'hello'))
+    thread.start()
+    thread.join()
+    assert received == []
+    assert harness.run_until(lambda: received)
+    assert received == [('hello', threading.get_ident())]
+
+def test_unregistered_custom_event_is_not_fired(app):
+    app.registerCustomEvent('test_event')
+    assert app.unregisterCustomEvent('test_event')
+    assert not app.fireCustomEvent('test_event')
+
+def test_timeline_groups_and_recomputes():
+    timeline = harness.build_timeline(10, group_size=3, group_every=5)
+    # Collapsed groups replace their objects at the top level
+    assert timeline.count == 6
+    group = timeline.item(0)
+    assert group.isGroup
+    assert [obj.name for obj in group] == ['Sketch0', 'Extrude1', 'Extrude2']
+    assert timeline.markerPosition == 10
+
+    timeline.item(5).isSuppressed = True
+    assert timeline.recomputes == 1
+    timeline.markerPosition = 0
+    timeline.item(5).isSuppressed = False
+    assert timeline.recomputes == 1
+    timeline.markerPosition = 10
+    assert timeline.recomputes == 2
+
+def test_nested_groups():
+    timeline = harness.build_timeline(5, nest_depth=3)
+    assert timeline.count == 3
+    outer = timeline.item(0)
+    assert [obj.name for obj in outer] == ['Sketch0', 'Nested1']
+    inner = outer.item(1).item(1)
+    assert inner.index == 2
+    assert [obj.name for obj in inner] == ['Extrude2']
+
+    # Expanded groups show what is inside them at the top level
+    outer.isCollapsed = False
+    assert [obj.name for obj in timeline] == ['Sketch0', 'Nested1', 'Sketch3', 'Extrude4']
+
+def test_call_latency(app):
+    adsk.core.set_call_latency(0.001)
+    before = adsk.core.api_calls
+    timeline = harness.build_timeline(5)
+    names = [obj.name for obj in timeline]
+    assert len(names) == 5
+    assert adsk.core.api_calls - before >= 10
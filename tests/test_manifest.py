@@ -0,0 +1,56 @@
+# Tests of manifest reading and ManifestIndex.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+from thomasa88lib import manifest
+
+def write_manifest(folder, addin_id, version):
+    folder.mkdir(exist_ok=True)
+    with open(folder / f'{folder.name}.manifest', 'w', encoding='utf-8') as f:
+        json.dump({ 'id': addin_id, 'version': version }, f)
+
+def test_read_returns_a_copy(tmp_path):
+    write_manifest(tmp_path / 'AddIn', 'addin-id', '1.0')
+    first = manifest.read(tmp_path / 'AddIn')
+    first['display'] = 'changed'
+    assert 'display' not in manifest.read(tmp_path / 'AddIn')
+
+def test_read_sees_changed_file(tmp_path):
+    write_manifest(tmp_path / 'AddIn', 'addin-id', '1.0')
+    assert manifest.read(tmp_path / 'AddIn')['version'] == '1.0'
+    write_manifest(tmp_path / 'AddIn', 'addin-id', '1.10')
+    assert manifest.read(tmp_path / 'AddIn')['version'] == '1.10'
+
+def test_index_only_parses_changed_manifests(tmp_path):
+    write_manifest(tmp_path / 'A', 'a', '1')
+    write_manifest(tmp_path / 'B', 'b', '1')
+    index = manifest.ManifestIndex(tmp_path)
+    assert index.parsed == 2
+    write_manifest(tmp_path / 'B', 'b', '22')
+    index.refresh()
+    assert index.parsed == 3
+    assert index.reused == 1
+    assert index.get('b').version == '22'
@@ -0,0 +1,115 @@
+# Tests of SettingsManager and its backends.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+from thomasa88lib import events
+from thomasa88lib import settings
+
+import harness
+
+DEFAULTS = { 'a': 0, 'b': 0 }
+
+def write_externally(path, values):
+    # Another process (or add-in) writes the file
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(values, f)
+
+def read_file(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def test_write_through(tmp_path):
+    path = tmp_path / 'settings.json'
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(path))
+    manager['a'] = 1
+    assert read_file(path) == { 'a': 1, 'b': 0 }
+
+def test_external_change_is_reloaded(tmp_path):
+    path = tmp_path / 'settings.json'
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(path),
+                                       auto_reload=True, reload_interval=0)
+    write_externally(path, { 'a': 99, 'b': 0, 'c': 1 })
+    assert manager['a'] == 99
+
+def test_reload_keeps_unwritten_changes_of_other_manager(tmp_path):
+    path = tmp_path / 'settings.json'
+    a = settings.SettingsManager(dict(DEFAULTS), filename=str(path), flush_delay=10,
+                                 auto_reload=True, reload_interval=0)
+    b = settings.SettingsManager(dict(DEFAULTS), filename=str(path),
+                                 auto_reload=True, reload_interval=0)
+    a['a'] = 1
+    write_externally(path, { 'a': 99, 'b': 0, 'c': 1 })
+    # b has no changes of its own, but must not reload over the changes of a
+    assert b['a'] == 1
+    a.clean_up()
+    b.clean_up()
+    assert read_file(path)['a'] == 1
+
+def test_watch_restarts_with_new_events_manager(tmp_path, app):
+    path = tmp_path / 'settings.json'
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(path),
+                                       auto_reload=True, reload_interval=0.01)
+    changes = []
+    first = events.EventsManager()
+    manager.watch(first, changes.append)
+    first.clean_up()
+
+    second = events.EventsManager()
+    manager.watch(second, changes.append)
+    write_externally(path, { 'a': 99, 'b': 0, 'c': 1 })
+    assert harness.run_until(lambda: changes)
+    assert manager['a'] == 99
+    manager.clean_up()
+    second.clean_up()
+
+def test_journal_is_compacted_repeatedly(tmp_path):
+    path = tmp_path / 'settings.json'
+    backend_holder = []
+
+    def backend(file_path):
+        backend = settings.JournalBackend(file_path, compact_bytes=2000)
+        backend_holder.append(backend)
+        return backend
+
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(path), backend=backend)
+    for i in range(5000):
+        manager['a'] = i
+    journal_size = (tmp_path / 'settings.json.journal').stat().st_size
+    manager.clean_up()
+    assert backend_holder[0].compactions > 1
+    assert journal_size < 10000
+    reloaded = settings.SettingsManager(dict(DEFAULTS), filename=str(path),
+                                        backend=settings.JournalBackend)
+    assert reloaded['a'] == 4999
+
+def test_journal_size_is_counted_in_bytes(tmp_path):
+    path = tmp_path / 'settings.json'
+    manager = settings.SettingsManager(dict(DEFAULTS), filename=str(path),
+                                       backend=settings.JournalBackend)
+    manager['ä'] = 'å' * 100
+    manager['a'] = 'ö' * 100
+    assert manager.backend._journal_size == (tmp_path / 'settings.json.journal').stat().st_size
+    manager.clean_up()
@@ -0,0 +1,124 @@
+# Tests of the time-sliced task runner of EventsManager.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+
+from thomasa88lib import events
+
+import harness
+
+def counting_task(log, name, steps):
+    for i in range(steps):
+        log.append(name)
+        yield (i + 1) / steps
+    return name
+
+def test_task_runs_to_completion_with_progress(events_manager):
+    log = []
+    progress = []
+    task = events_manager.run_task(counting_task(log, 'a', 4),
+                                   progress_callback=lambda t: progress.append(t.progress))
+    assert harness.run_until(lambda: task.is_done)
+    assert task.state == events.TASK_DONE
+    assert task.result == 'a'
+    assert progress == [0.25, 0.5, 0.75, 1.0]
+
+def test_slices_give_control_back_to_fusion(app):
+    events_manager = events.EventsManager(task_slice_secs=0.005)
+    log = []
+    other = events_manager.register_event('other_event')
+    events_manager.add_handler(other, callback=lambda args: log.append('event'))
+
+    def slow_task():
+        for _ in range(20):
+            time.sleep(0.002)
+            log.append('step')
+            app.fireCustomEvent('other_event')
+            yield
+
+    task = events_manager.run_task(slow_task())
+    assert events_manager.task_runner.slice_secs == 0.005
+    app.process_events()
+    # Only a few steps fit in one slice
+    assert 0 < log.count('step') < 20
+    assert harness.run_until(lambda: task.is_done)
+    harness.process_pending()
+    assert log.count('event') == 20
+    # Events fired during a slice are handled before the next slice
+    assert log.index('event') < len(log) - 1 - log[::-1].index('step')
+    events_manager.clean_up()
+
+def test_higher_priority_runs_first(events_manager):
+    log = []
+    low = events_manager.run_task(counting_task(log, 'low', 3), priority=0)
+    high = events_manager.run_task(counting_task(log, 'high', 3), priority=1)
+    assert harness.run_until(lambda: low.is_done and high.is_done)
+    assert log == ['high'] * 3 + ['low'] * 3
+
+def test_equal_priority_tasks_take_turns(events_manager):
+    log = []
+    a = events_manager.run_task(counting_task(log, 'a', 3))
+    b = events_manager.run_task(counting_task(log, 'b', 3))
+    assert harness.run_until(lambda: a.is_done and b.is_done)
+    assert log == ['a', 'b'] * 3
+
+def test_cancel_closes_generator(events_manager):
+    closed = []
+    done = []
+
+    def endless():
+        try:
+            while True:
+                yield
+        finally:
+            closed.append(True)
+
+    task = events_manager.run_task(endless(), done_callback=done.append)
+    harness.run_until(lambda: False, timeout=0.05)
+    task.cancel()
+    assert task.state == events.TASK_CANCELLED
+    assert closed == [True]
+    assert done == [task]
+    assert not events_manager.task_runner.tasks
+
+def test_failing_task_is_reported(events_manager, app):
+    def failing():
+        yield
+        raise ValueError('task failed')
+
+    task = events_manager.run_task(failing())
+    assert harness.run_until(lambda: task.is_done)
+    assert task.state == events.TASK_FAILED
+    assert isinstance(task.exception, ValueError)
+    assert any('task failed' in text for text in app.userInterface.message_boxes)
+
+def test_clean_up_cancels_tasks(events_manager):
+    def endless():
+        while True:
+            yield
+
+    task = events_manager.run_task(endless())
+    events_manager.clean_up()
+    assert task.state == events.TASK_CANCELLED
@@ -0,0 +1,160 @@
+# Tests of timeline flattening, lookups and caching.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+import adsk.core
+
+from thomasa88lib import timeline as tl
+
+import harness
+
+def test_flatten_expands_groups():
+    timeline = harness.build_timeline(100, group_size=3, group_every=10)
+    flat = tl.flatten_timeline(timeline)
+    assert [obj.index for obj in flat] == list(range(100))
+
+def test_flatten_deeply_nested_groups():
+    # Deeper than the recursion limit
+    timeline = harness.build_timeline(3000, nest_depth=2000)
+    flat = tl.flatten_timeline(timeline)
+    assert [obj.index for obj in flat] == list(range(3000))
+
+def test_iter_flat_timeline_range_and_groups():
+    timeline = harness.build_timeline(20, nest_depth=3)
+    objs = list(tl.iter_flat_timeline(timeline, start=1, stop=5, include_groups=True))
+    assert [obj.name for obj in objs] == ['Nested0', 'Nested1', 'Extrude1', 'Nested2',
+                                          'Extrude2', 'Sketch3', 'Extrude4']
+
+def test_index_lookups_match_flat_timeline():
+    timeline = harness.build_timeline(200, group_size=5, group_every=20)
+    index = tl.TimelineIndex(timeline=timeline)
+    for obj in tl.iter_flat_timeline(timeline):
+        assert index.get_by_token(obj.entity.entityToken) is obj
+        assert index.get_by_name(obj.name) is obj
+        assert index.get_by_index(obj.index) is obj
+    assert index.get_by_token('missing') is None
+    assert index.get_by_name('missing') is None
+    assert index.get_by_index(200) is None
+    assert index.builds == 1
+
+def test_index_of_active_design_is_invalidated_by_events(events_manager, app):
+    index = tl.TimelineIndex(events_manager)
+    timeline = harness.build_timeline(10)
+    harness.open_design(timeline)
+    assert index.get_by_name('Sketch9').index == 9
+    assert index.builds == 1
+
+    timeline.add_object('Sketch10')
+    assert index.get_by_name('Sketch10') is None
+    app.fire_event(app.userInterface.commandTerminated, adsk.core.ApplicationCommandEventArgs())
+    assert index.get_by_name('Sketch10').index == 10
+    assert index.builds == 2
+
+    other = harness.build_timeline(3)
+    harness.open_design(other)
+    assert index.get_by_index(0) is other.item(0)
+    assert index.builds == 3
+
+    index.clean_up()
+    app.fire_event(app.documentActivated, adsk.core.DocumentEventArgs())
+    assert index.valid
+
+def test_classifier_matches_get_occurrence_type():
+    timeline = harness.build_timeline(100, group_size=5, group_every=20, occurrence_every=7)
+    flat = tl.flatten_timeline(timeline)
+    expected = [tl.get_occurrence_type(obj) for obj in flat]
+    classifier = tl.OccurrenceClassifier()
+    types, positions = classifier.classify(flat)
+    assert list(types) == expected
+    types, positions = classifier.classify(flat, tl.TimelineSnapshot.take(timeline))
+    assert list(types) == expected
+    assert positions[tl.OCCURRENCE_COPY_COMP] == [i for i, t in enumerate(expected)
+                                                  if t == tl.OCCURRENCE_COPY_COMP]
+
+def test_classifier_reuses_results_without_api_calls():
+    timeline = harness.build_timeline(100, occurrence_every=7)
+    flat = tl.flatten_timeline(timeline)
+    classifier = tl.OccurrenceClassifier()
+    classifier.classify(flat, tl.TimelineSnapshot.take(timeline))
+    assert classifier.classified == 100
+
+    flat[14].name = 'CopyPaste Component3:1'
+    snapshot = tl.TimelineSnapshot.take(timeline)
+    before = adsk.core.api_calls
+    types, positions = classifier.classify(flat, snapshot)
+    # Only the renamed object is read again
+    assert adsk.core.api_calls - before == 1
+    assert classifier.classified == 101
+    assert classifier.reused == 99
+    assert types[14] == tl.OCCURRENCE_COPY_COMP
+
+def test_classifier_rejects_other_snapshot():
+    classifier = tl.OccurrenceClassifier()
+    with pytest.raises(ValueError):
+        classifier.classify(tl.flatten_timeline(harness.build_timeline(10)),
+                            tl.TimelineSnapshot.take(harness.build_timeline(11)))
+
+def test_timeline_cache_hit_after_first_call(events_manager):
+    cache = tl.TimelineCache(events_manager)
+    timeline = harness.build_timeline(5)
+    harness.open_design(timeline)
+    assert cache.get_timeline() == (tl.TIMELINE_STATUS_OK, timeline)
+    assert cache.get_timeline() == (tl.TIMELINE_STATUS_OK, timeline)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+@pytest.mark.parametrize('event_name, args_class', [
+    ('documentActivated', adsk.core.DocumentEventArgs),
+    ('documentClosed', adsk.core.DocumentEventArgs),
+    ('commandTerminated', adsk.core.ApplicationCommandEventArgs),
+])
+def test_timeline_cache_miss_after_event(events_manager, app, event_name, args_class):
+    cache = tl.TimelineCache(events_manager)
+    harness.open_design(harness.build_timeline(5))
+    cache.get_timeline()
+    sender = app.userInterface if event_name == 'commandTerminated' else app
+    app.fire_event(getattr(sender, event_name), args_class())
+    cache.get_timeline()
+    assert (cache.hits, cache.misses) == (0, 2)
+
+def test_timeline_cache_does_not_cache_product_not_ready(events_manager):
+    cache = tl.TimelineCache(events_manager)
+    assert cache.get_timeline() == (tl.TIMELINE_STATUS_PRODUCT_NOT_READY, None)
+    assert cache.get_timeline() == (tl.TIMELINE_STATUS_PRODUCT_NOT_READY, None)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    # Start-up completion is not an event, so the next call must ask again
+    timeline = harness.build_timeline(5)
+    harness.open_design(timeline)
+    assert cache.get_timeline() == (tl.TIMELINE_STATUS_OK, timeline)
+
+def test_timeline_cache_clean_up_removes_handlers(events_manager, app):
+    cache = tl.TimelineCache(events_manager)
+    assert len(events_manager.handlers) == 3
+    cache.clean_up()
+    assert not events_manager.handlers
+    assert not app._document_activated.handlers
+    assert not app._document_closed.handlers
+    assert not app.userInterface._command_terminated.handlers
@@ -0,0 +1,90 @@
+# Tests of TimelineBatch against a fake timeline that counts recomputes.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from thomasa88lib import timeline as tl
+
+import harness
+
+def test_suppressions_recompute_once():
+    timeline = harness.build_timeline(1000)
+    batch = tl.TimelineBatch(timeline)
+    for i in range(100, 1000, 10):
+        batch.suppress(timeline.item(i))
+    batch.apply()
+    assert timeline.recomputes == 1
+    assert timeline.marker_log == [100, 1000]
+    assert all(timeline.item(i).isSuppressed for i in range(100, 1000, 10))
+    assert set(batch.timings) == { 'sort', 'rollback', 'apply', 'restore' }
+
+def test_suppressions_without_batch_recompute_each_time():
+    timeline = harness.build_timeline(1000)
+    for i in range(100, 1000, 10):
+        timeline.item(i).isSuppressed = True
+    assert timeline.recomputes == 90
+
+def test_renames_do_not_roll_back():
+    timeline = harness.build_timeline(1000)
+    batch = tl.TimelineBatch(timeline)
+    for obj in timeline:
+        batch.rename(obj, obj.name + '_renamed')
+    batch.apply()
+    assert timeline.marker_log == []
+    assert timeline.recomputes == 0
+    assert timeline.item(999).name == 'Sketch999_renamed'
+
+def test_rename_does_not_move_rollback_point():
+    timeline = harness.build_timeline(1000)
+    batch = tl.TimelineBatch(timeline)
+    batch.rename(timeline.item(0), 'First')
+    batch.suppress(timeline.item(900))
+    batch.apply()
+    assert timeline.marker_log == [900, 1000]
+    assert timeline.item(0).name == 'First'
+
+def test_moves_recompute_once():
+    timeline = harness.build_timeline(100)
+    moved = [timeline.item(90), timeline.item(95)]
+    batch = tl.TimelineBatch(timeline)
+    for obj in moved:
+        batch.move(obj, 50)
+    batch.apply()
+    assert timeline.recomputes == 1
+    assert timeline.marker_log == [50, 100]
+    assert [timeline.item(i).name for i in (50, 51, 52)] == ['Extrude95', 'Sketch90', 'Extrude50']
+
+def test_failed_apply_restores_marker_and_empties_batch():
+    timeline = harness.build_timeline(100)
+    batch = tl.TimelineBatch(timeline)
+    batch.suppress(timeline.item(10))
+    batch.move(timeline.item(20), 1000)
+    with pytest.raises(Exception):
+        batch.apply()
+    assert timeline.markerPosition == 100
+    assert not batch.edits and not batch.moves
+    # Nothing is applied again
+    batch.apply()
+    assert timeline.marker_log == [10, 100]
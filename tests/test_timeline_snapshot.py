@@ -0,0 +1,90 @@
+# Tests of TimelineSnapshot and TimelineDiff.
+#
+# This file is part of thomasa88lib, a library of useful Fusion 360
+# add-in/script functions.
+#
+# Copyright (c) 2026 Thomas Axelsson
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from array import array
+
+from thomasa88lib import timeline as tl
+
+import harness
+
+def test_snapshot_of_timeline_with_groups():
+    timeline = harness.build_timeline(10, group_size=3, group_every=5)
+    snapshot = tl.TimelineSnapshot.take(timeline)
+    # Ten objects and two groups
+    assert len(snapshot) == 12
+    assert snapshot.is_group.tolist().count(1) == 2
+    assert snapshot.tokens[0] is None
+    assert snapshot.names[1] == 'Sketch0'
+
+def test_unchanged_timeline_has_empty_diff():
+    timeline = harness.build_timeline(100, group_size=5, group_every=20)
+    old = tl.TimelineSnapshot.take(timeline)
+    new = tl.TimelineSnapshot.take(timeline)
+    assert not old.diff(new)
+
+def test_diff_reports_rename_suppress_move_and_insert():
+    timeline = harness.build_timeline(20)
+    old = tl.TimelineSnapshot.take(timeline)
+    timeline.item(3).name = 'Renamed'
+    timeline.item(5).isSuppressed = True
+    # Move object 15 to the start
+    timeline.item(15).reorder(0)
+    timeline.add_object('New', None)
+    new = tl.TimelineSnapshot.take(timeline)
+
+    diff = old.diff(new)
+    assert diff.renamed == [(3, 4)]
+    assert diff.suppressed == [(5, 6)]
+    assert diff.moved == [(15, 0)]
+    assert diff.inserted == [20]
+    assert diff.removed == []
+
+def test_diff_reports_removed():
+    timeline = harness.build_timeline(10)
+    old = tl.TimelineSnapshot.take(timeline)
+    data = old.to_dict()
+    for values in data.values():
+        del values[4]
+    new = tl.TimelineSnapshot.from_dict(data)
+    diff = old.diff(new)
+    assert diff.removed == [4]
+    assert not diff.moved and not diff.inserted
+
+def test_objects_without_tokens_are_matched_by_name():
+    snapshot = tl.TimelineSnapshot(['a', 'b', 'a'], [None, None, None], array('b', [0, 0, 0]),
+                                   array('b', [0, 0, 0]), array('l', [0, 1, 2]))
+    assert snapshot.keys() == ['name:a', 'name:b', 'name:a#1']
+
+def test_json_round_trip():
+    timeline = harness.build_timeline(50, group_size=4, group_every=10, occurrence_every=7)
+    snapshot = tl.TimelineSnapshot.take(timeline)
+    loaded = tl.TimelineSnapshot.from_json(snapshot.to_json())
+    assert loaded.to_dict() == snapshot.to_dict()
+    assert not snapshot.diff(loaded)
+
+def test_longest_increasing_run_gives_minimal_moves():
+    values = [0, 8, 1, 2, 9, 3, 4]
+    run = tl._longest_increasing_run(values)
+    assert sorted(values[i] for i in run) == [0, 1, 2, 3, 4]
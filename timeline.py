@@ -23,7 +23,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import adsk.core, adsk.fusion, adsk.cam, traceback
+from array import array
+import bisect
+import json
+import time
 
 TIMELINE_STATUS_OK = 0
 TIMELINE_STATUS_PRODUCT_NOT_READY = 1
@@ -37,6 +40,7 @@ OCCURRENCE_SHEET_METAL = 3
 OCCURRENCE_BODIES_COMP = 4
 
 def get_timeline():
+    import adsk.core, adsk.fusion
     app = adsk.core.Application.get()
 
     # activeProduct throws if start-up is not completed. It also throws when closing down
@@ -56,38 +60,123 @@ def get_timeline():
     else:
         return (TIMELINE_STATUS_NOT_PARAMETRIC, None)
 
-def flatten_timeline(timeline_collection):
+class TimelineCache:
+    '''
+    Remembers the result of get_timeline() for the active document.
+
+    The result is dropped when a document is activated or closed, and when a
+    command terminates (the design type is changed by a command). The
+    "product not ready" status is never cached, as start-up completion does
+    not generate any event.
+    '''
+    def __init__(self, events_manager):
+        self.hits = 0
+        self.misses = 0
+        self._result = None
+        self._events_manager = events_manager
+        app = events_manager.app
+        self._handlers = [
+            events_manager.add_handler(app.documentActivated, callback=self._invalidate_handler),
+            events_manager.add_handler(app.documentClosed, callback=self._invalidate_handler),
+            events_manager.add_handler(events_manager.ui.commandTerminated,
+                                       callback=self._invalidate_handler),
+        ]
+
+    def clean_up(self):
+        for handler_info in self._handlers:
+            self._events_manager.remove_handler(handler_info)
+        self._handlers = []
+        self._result = None
+
+    def get_timeline(self):
+        '''Returns the same (status, timeline) as get_timeline().'''
+        result = self._result
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = get_timeline()
+        if result[0] != TIMELINE_STATUS_PRODUCT_NOT_READY:
+            self._result = result
+        return result
+
+    def invalidate(self):
+        self._result = None
+
+    def _invalidate_handler(self, args):
+        self._result = None
+
+def flatten_timeline(timeline_collection, read_scope=None):
     '''
     A flat timeline representation, with all objects except any group objects.
     (Groups disappear when expanded - The icon is no longer there in the timeline.)
+
+    read_scope: Optional apicache.ReadScope. The returned objects are then
+                caching proxies.
     '''
-    flat_collection = []
-    
-    for obj in timeline_collection:
-        if obj.isGroup:
-            # Groups only appear in the timeline if they are collapsed
-            # In that case, the features inside the group are only listed within the group
-            # and not as part of the top-level timeline. So timeline essentially gives us
-            # what is literally shown in the timeline control in Fusion.
-
-            # Flatten the group
-            flat_collection += flatten_timeline(obj)
+    if read_scope:
+        timeline_collection = read_scope.wrap(timeline_collection)
+    return list(iter_flat_timeline(timeline_collection))
+
+def iter_flat_timeline(timeline_collection, predicate=None, start=None, stop=None,
+                       include_groups=False):
+    '''
+    Lazily yields the objects of flatten_timeline().
+
+    predicate: Only yield objects for which predicate(obj) is true.
+    start, stop: Only yield objects with start <= obj.index < stop.
+                 E.g. stop=timeline.markerPosition gives the objects
+                 before the marker. The walk ends at the first object
+                 with an index of stop or more.
+    include_groups: Also yield the group objects, before their contents.
+                    Groups are not checked against predicate and range.
+    '''
+    check_range = start is not None or stop is not None
+    # Groups are walked with an explicit stack of iterators, instead of
+    # recursion, so no intermediate lists are built.
+    stack = [iter(timeline_collection)]
+    while stack:
+        for obj in stack[-1]:
+            if obj.isGroup:
+                # Groups only appear in the timeline if they are collapsed
+                # In that case, the features inside the group are only listed within the group
+                # and not as part of the top-level timeline. So timeline essentially gives us
+                # what is literally shown in the timeline control in Fusion.
+
+                # Flatten the group
+                if include_groups:
+                    yield obj
+                stack.append(iter(obj))
+                break
+            if check_range:
+                index = obj.index
+                if stop is not None and index >= stop:
+                    return
+                if start is not None and index < start:
+                    continue
+            if predicate is None or predicate(obj):
+                yield obj
         else:
-            flat_collection.append(obj)
+            stack.pop()
 
-    return flat_collection
+def get_occurrence_type(timeline_obj, read_scope=None):
+    '''Heuristics to determine component creation feature
 
-def get_occurrence_type(timeline_obj):
-    '''Heuristics to determine component creation feature'''
-    
-    if timeline_obj.entity.classType() != 'adsk::fusion::Occurrence':
+    read_scope: Optional apicache.ReadScope, to cache the API reads.
+    '''
+    if read_scope:
+        timeline_obj = read_scope.wrap(timeline_obj)
+    return _classify_occurrence(timeline_obj.entity, timeline_obj.name)
+
+def _classify_occurrence(entity, name):
+    if entity.classType() != 'adsk::fusion::Occurrence':
         return OCCURRENCE_NOT_OCCURRENCE
 
     # When prefixed with a "type prefix", we can be sure of the occurence type.
     # In that case, the name of the timeline object cannot be edited.
     # This, of course, assumes that the user does not create a component starting
     # with such a string.
-    split_name = timeline_obj.name.split(' ', maxsplit=1)
+    split_name = name.split(' ', maxsplit=1)
     # User can have input spaces, so a length of split_name > 1 does not automatically
     # mean that we have a type prefix. So let's try.
     # TODO: We can probably compare with the component name to find out if this is
@@ -102,7 +191,384 @@ def get_occurrence_type(timeline_obj):
     if potential_type_prefix == 'CopyPaste':
         return OCCURRENCE_COPY_COMP
 
-    if hasattr(timeline_obj.entity, 'bRepBodies'):
+    if hasattr(entity, 'bRepBodies'):
         return OCCURRENCE_BODIES_COMP
 
     return OCCURRENCE_UNKNOWN_COMP
+
+class OccurrenceClassifier:
+    '''
+    Batch version of get_occurrence_type(), for whole timelines.
+
+    When a TimelineSnapshot of the timeline is given, results are remembered
+    per entity token, together with the timeline object name, both taken from
+    the snapshot. Unchanged objects are then not read from Fusion at all on
+    the next call, and only new, changed or renamed objects are classified.
+    Without a snapshot, each object is classified like get_occurrence_type(),
+    as reading the token of every object would cost more than it saves.
+    '''
+    def __init__(self):
+        # entity token -> (name, occurrence type)
+        self.cache = {}
+        self.classified = 0
+        self.reused = 0
+
+    def classify(self, flat_timeline, snapshot=None):
+        '''
+        Classifies all objects of a flattened timeline.
+
+        snapshot: Optional TimelineSnapshot, taken of the same timeline state.
+
+        Returns (types, positions):
+          types: array('b') with the OCCURRENCE_* type of each object.
+          positions: dict from OCCURRENCE_* type to a list of the positions
+                     in flat_timeline with that type.
+        '''
+        types = array('b')
+        positions = {}
+        if snapshot is None:
+            for position, obj in enumerate(flat_timeline):
+                entity = obj.entity
+                if entity is None:
+                    occurrence_type = OCCURRENCE_NOT_OCCURRENCE
+                else:
+                    occurrence_type = _classify_occurrence(entity, obj.name)
+                    self.classified += 1
+                types.append(occurrence_type)
+                positions.setdefault(occurrence_type, []).append(position)
+            return types, positions
+
+        # The snapshot also has the groups
+        objects = [(name, token) for name, token, is_group
+                   in zip(snapshot.names, snapshot.tokens, snapshot.is_group) if not is_group]
+        if len(objects) != len(flat_timeline):
+            raise ValueError('The snapshot does not match the timeline')
+        old_cache = self.cache
+        cache = {}
+        for position, (obj, (name, token)) in enumerate(zip(flat_timeline, objects)):
+            if token is None:
+                occurrence_type = OCCURRENCE_NOT_OCCURRENCE
+            else:
+                cached = old_cache.get(token)
+                if cached is not None and cached[0] == name:
+                    occurrence_type = cached[1]
+                    self.reused += 1
+                else:
+                    occurrence_type = _classify_occurrence(obj.entity, name)
+                    self.classified += 1
+                cache[token] = (name, occurrence_type)
+            types.append(occurrence_type)
+            positions.setdefault(occurrence_type, []).append(position)
+        # Only keep the items that are still in the timeline
+        self.cache = cache
+        return types, positions
+
+class TimelineIndex:
+    '''
+    Lookup tables from entity token, name and index to the objects of the
+    flattened timeline.
+
+    The tables are built on the first lookup and reused until invalidate()
+    is called. When an EventsManager is given, the index is invalidated when
+    a document is activated or a command terminates (this includes undo and
+    redo).
+
+    timeline: Timeline collection to index. Defaults to the timeline of the
+              active design, from get_timeline().
+
+    Note that Fusion does not guarantee that an entity always gives the same
+    entity token.
+    '''
+    def __init__(self, events_manager=None, timeline=None):
+        self.timeline = timeline
+        self.valid = False
+        self.builds = 0
+        self.by_token = {}
+        self.by_name = {}
+        self.by_index = {}
+        self._handlers = []
+        if events_manager:
+            self._handlers = [
+                events_manager.add_handler(events_manager.app.documentActivated,
+                                           callback=self._model_changed_handler),
+                events_manager.add_handler(events_manager.ui.commandTerminated,
+                                           callback=self._model_changed_handler),
+            ]
+            self._events_manager = events_manager
+
+    def clean_up(self):
+        for handler_info in self._handlers:
+            self._events_manager.remove_handler(handler_info)
+        self._handlers = []
+
+    def invalidate(self):
+        self.valid = False
+
+    def get_by_token(self, entity_token):
+        self._ensure_valid()
+        return self.by_token.get(entity_token)
+
+    def get_by_name(self, name):
+        '''Returns the first timeline object with the given name.'''
+        self._ensure_valid()
+        return self.by_name.get(name)
+
+    def get_by_index(self, index):
+        self._ensure_valid()
+        return self.by_index.get(index)
+
+    def _ensure_valid(self):
+        if not self.valid:
+            self.build()
+
+    def build(self):
+        by_token = {}
+        by_name = {}
+        by_index = {}
+        timeline = self.timeline
+        if timeline is None:
+            status, timeline = get_timeline()
+        if timeline is not None:
+            for obj in iter_flat_timeline(timeline):
+                entity = obj.entity
+                if entity is not None:
+                    by_token.setdefault(entity.entityToken, obj)
+                by_name.setdefault(obj.name, obj)
+                by_index[obj.index] = obj
+        self.by_token = by_token
+        self.by_name = by_name
+        self.by_index = by_index
+        self.valid = True
+        self.builds += 1
+
+    def _model_changed_handler(self, args):
+        self.invalidate()
+
+class TimelineSnapshot:
+    '''
+    Compact copy of the timeline state, stored as parallel arrays with one
+    entry per object of the flattened timeline, including groups.
+
+    Use diff() to find out what changed between two snapshots. Snapshots
+    can be stored with to_json() and loaded with from_json(), e.g. to
+    compare with the timeline in a later session.
+    '''
+    def __init__(self, names=None, tokens=None, suppressed=None, is_group=None, indices=None):
+        self.names = names if names is not None else []
+        # None for objects without an entity, such as groups
+        self.tokens = tokens if tokens is not None else []
+        self.suppressed = suppressed if suppressed is not None else array('b')
+        self.is_group = is_group if is_group is not None else array('b')
+        self.indices = indices if indices is not None else array('l')
+
+    @classmethod
+    def take(cls, timeline_collection):
+        snapshot = cls()
+        for obj in iter_flat_timeline(timeline_collection, include_groups=True):
+            is_group = obj.isGroup
+            token = None
+            if not is_group:
+                entity = obj.entity
+                if entity is not None:
+                    token = entity.entityToken
+            snapshot.names.append(obj.name)
+            snapshot.tokens.append(token)
+            snapshot.suppressed.append(obj.isSuppressed)
+            snapshot.is_group.append(is_group)
+            snapshot.indices.append(obj.index)
+        return snapshot
+
+    def __len__(self):
+        return len(self.names)
+
+    def keys(self):
+        '''Identity of each object, for matching objects between snapshots.
+        The entity token is used if there is one, otherwise the name.'''
+        tokens = self.tokens
+        if None not in tokens and len(set(tokens)) == len(tokens):
+            # Common case: All objects have unique tokens
+            return tokens
+        keys = []
+        seen = {}
+        for token, name, is_group in zip(self.tokens, self.names, self.is_group):
+            if token is not None:
+                key = token
+            else:
+                key = ('group:' if is_group else 'name:') + name
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            if count:
+                key = f'{key}#{count}'
+            keys.append(key)
+        return keys
+
+    def diff(self, new):
+        '''Compares this (older) snapshot with a newer snapshot.'''
+        return TimelineDiff.compute(self, new)
+
+    def to_dict(self):
+        return {
+            'names': list(self.names),
+            'tokens': list(self.tokens),
+            'suppressed': self.suppressed.tolist(),
+            'is_group': self.is_group.tolist(),
+            'indices': self.indices.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['names'], data['tokens'], array('b', data['suppressed']),
+                   array('b', data['is_group']), array('l', data['indices']))
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, json_str):
+        return cls.from_dict(json.loads(json_str))
+
+class TimelineDiff:
+    '''
+    Changes between two TimelineSnapshots.
+
+    inserted: Positions in the new snapshot of objects that are not in the old.
+    removed: Positions in the old snapshot of objects that are not in the new.
+    moved, renamed, suppressed: (old position, new position) of objects that
+        changed order, name or suppression state.
+
+    Objects that changed order are those outside of the longest run of objects
+    that kept their relative order, which is the minimal set of moves.
+    '''
+    def __init__(self):
+        self.inserted = []
+        self.removed = []
+        self.moved = []
+        self.renamed = []
+        self.suppressed = []
+
+    def __bool__(self):
+        return bool(self.inserted or self.removed or self.moved or
+                    self.renamed or self.suppressed)
+
+    @classmethod
+    def compute(cls, old, new):
+        diff = cls()
+        old_positions = { key: pos for pos, key in enumerate(old.keys()) }
+        # Old positions of the kept objects, in new order
+        kept = []
+        for new_pos, key in enumerate(new.keys()):
+            old_pos = old_positions.pop(key, None)
+            if old_pos is None:
+                diff.inserted.append(new_pos)
+                continue
+            kept.append((old_pos, new_pos))
+            if old.names[old_pos] != new.names[new_pos]:
+                diff.renamed.append((old_pos, new_pos))
+            if old.suppressed[old_pos] != new.suppressed[new_pos]:
+                diff.suppressed.append((old_pos, new_pos))
+        diff.removed = sorted(old_positions.values())
+        kept_old_positions = [old_pos for old_pos, _ in kept]
+        if any(a > b for a, b in zip(kept_old_positions, kept_old_positions[1:])):
+            in_order = _longest_increasing_run(kept_old_positions)
+            diff.moved = [pair for i, pair in enumerate(kept) if i not in in_order]
+        return diff
+
+def _longest_increasing_run(values):
+    '''Returns the set of indices in values of a longest strictly increasing
+    subsequence. O(n log n).'''
+    tail_values = []
+    tail_indices = []
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        pos = bisect.bisect_left(tail_values, value)
+        if pos > 0:
+            previous[i] = tail_indices[pos - 1]
+        if pos == len(tail_values):
+            tail_values.append(value)
+            tail_indices.append(i)
+        else:
+            tail_values[pos] = value
+            tail_indices[pos] = i
+    result = set()
+    i = tail_indices[-1] if tail_indices else -1
+    while i != -1:
+        result.add(i)
+        i = previous[i]
+    return result
+
+class TimelineBatch:
+    '''
+    Collects edits to timeline objects and applies them together, to get one
+    recompute instead of one per edit.
+
+    When there are edits that make Fusion recompute (suppression and moves),
+    the marker is rolled back to before the first suppressed or moved object,
+    all edits are applied and the marker is then restored.
+
+    Usage:
+
+        batch = TimelineBatch(timeline)
+        for obj in objs:
+            batch.rename(obj, 'New name')
+        batch.apply()
+
+    Renames and suppressions are applied in timeline order. Moves are applied
+    last, in the order they were added.
+    '''
+    def __init__(self, timeline):
+        self.timeline = timeline
+        # (index, obj, attribute name, value)
+        self.edits = []
+        # (obj, before index)
+        self.moves = []
+        # Seconds per phase of the last apply()
+        self.timings = {}
+
+    def rename(self, timeline_obj, name):
+        self.edits.append((timeline_obj.index, timeline_obj, 'name', name))
+
+    def suppress(self, timeline_obj, suppress=True):
+        self.edits.append((timeline_obj.index, timeline_obj, 'isSuppressed', suppress))
+
+    def move(self, timeline_obj, before_index):
+        '''Moves the object to before the object at before_index.'''
+        self.moves.append((timeline_obj, before_index))
+
+    def apply(self):
+        '''Applies all edits and empties the batch. The batch is emptied also
+        when an edit fails, as the edits before it have then been applied.'''
+        timings = self.timings = {}
+        edits = self.edits
+        moves = self.moves
+        self.edits = []
+        self.moves = []
+
+        start = time.perf_counter()
+        edits.sort(key=lambda edit: edit[0])
+        # Renames do not make Fusion recompute, so they do not need a rollback
+        first_index = min([edit[0] for edit in edits if edit[2] == 'isSuppressed'] +
+                          [min(obj.index, before_index) for obj, before_index in moves],
+                          default=None)
+        timings['sort'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        timeline = self.timeline
+        old_marker = timeline.markerPosition
+        rolled_back = first_index is not None and first_index < old_marker
+        if rolled_back:
+            timeline.markerPosition = first_index
+        timings['rollback'] = time.perf_counter() - start
+
+        try:
+            start = time.perf_counter()
+            for index, obj, attribute, value in edits:
+                setattr(obj, attribute, value)
+            for obj, before_index in moves:
+                if not obj.reorder(before_index):
+                    raise Exception(f'Failed to move {obj.name} to before index {before_index}')
+            timings['apply'] = time.perf_counter() - start
+        finally:
+            start = time.perf_counter()
+            if rolled_back:
+                timeline.markerPosition = old_marker
+            timings['restore'] = time.perf_counter() - start
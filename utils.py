@@ -23,12 +23,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import adsk.core, adsk.fusion, adsk.cam, traceback
-
-import inspect
 import os
 import pathlib
+import queue
 import sys
+import threading
 
 def short_class(obj):
     '''Returns shortened name of Object class'''
@@ -68,28 +67,131 @@ def get_fusion_ui_resource_folder() -> pathlib.Path:
     '''
     global _resFolder
     if not _resFolder:
+        import adsk.core
         app = adsk.core.Application.get()
         _resFolder = app.userInterface.workspaces.itemById('FusionSolidEnvironment').resourceFolder.replace('/Environment/Model', '')
     return pathlib.Path(_resFolder)
 
+# Absolute file path per code filename. Filled by _code_path().
+_code_paths = {}
+
+def _code_path(code):
+    '''Gets the absolute path of the file that a code object was
+    compiled from. Cached, as it is used in every event callback.'''
+    filename = code.co_filename
+    path = _code_paths.get(filename)
+    if path is None:
+        path = os.path.abspath(filename)
+        _code_paths[filename] = path
+    return path
+
+# inspect.stack() builds frame info objects and loads source lines for every
+# frame on the stack, which is very slow. Walk the frames directly instead.
+
 def get_caller_path():
     '''Gets the filename of the file calling the function
     that called this function. Used by the library.
     
     That is, is nested in "two steps".
     '''
-    caller_file = os.path.abspath(inspect.stack()[2][1])
-    return caller_file
+    return _code_path(sys._getframe(2).f_code)
 
 def get_file_path():
     '''Gets the filename of the function that called this
     function.'''
-    caller_file = os.path.abspath(inspect.stack()[1][1])
-    return caller_file
+    return _code_path(sys._getframe(1).f_code)
 
 def get_file_dir():
     '''Gets the directory containing the file which function
     called this function.'''
-    caller_file = os.path.dirname(os.path.abspath(inspect.stack()[1][1]))
-    return caller_file
+    return os.path.dirname(_code_path(sys._getframe(1).f_code))
+
+def write_atomic(file_path, data):
+    '''Writes to a temporary file and then replaces the target file with it,
+    so that a crash never leaves a half-written file.'''
+    # Unique per thread, as writes from different threads can overlap.
+    # (tempfile is not used, as it is slow to import.)
+    temp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+class BackgroundLineWriter:
+    '''Appends lines of text to a file from a background thread, so that
+    the caller never waits for disk I/O.
+
+    The queue is bounded. Lines that do not fit are dropped and counted in
+    dropped. If max_bytes is set, the file is rotated when it grows past it,
+    keeping the given number of backups (file.1, file.2, ...).
+
+    format: Called in the background thread to turn each queued item into
+            a line, e.g. json.dumps. This keeps the formatting cost off the
+            calling thread.
+    '''
+    _STOP = object()
+
+    def __init__(self, file_path, max_queue=1024, max_bytes=None, backups=1, format=None):
+        self.file_path = file_path
+        self.format = format
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run,
+                                        name='thomasa88lib line writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def write(self, line):
+        '''Queues a line, or an item for format(). A newline is added.'''
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=1):
+        '''Writes the queued lines and stops the thread.'''
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _run(self):
+        f = open(self.file_path, 'a', encoding='utf-8')
+        try:
+            while True:
+                line = self._queue.get()
+                if line is self._STOP:
+                    return
+                if self.format:
+                    line = self.format(line)
+                f.write(line + '\n')
+                if self._queue.empty():
+                    f.flush()
+                    if self.max_bytes and f.tell() > self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.file_path, 'a', encoding='utf-8')
+        finally:
+            f.close()
 
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            older = f'{self.file_path}.{i}'
+            if os.path.exists(older):
+                os.replace(older, f'{self.file_path}.{i + 1}')
+        if self.backups > 0:
+            os.replace(self.file_path, f'{self.file_path}.1')
+        else:
+            os.remove(self.file_path)